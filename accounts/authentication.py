@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import LazyObject
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+def _user_key(user_pk):
+    return f"auth:user:{user_pk}"
+
+
+def forget_user(user_pk):
+    cache.delete(_user_key(user_pk))
+
+
+def load_user(user_pk):
+    # 권한 확인에 필요한 필드만 짧은 TTL 로 캐시해서 같은 유저의 연속된 쓰기 요청에서
+    # 조회를 한 번으로 줄인다 (비밀번호 해시 등은 공유 캐시에 올리지 않는다)
+    fields = cache.get(_user_key(user_pk))
+    if fields is None:
+        fields = (
+            get_user_model()
+            .objects.filter(pk=user_pk)
+            .values("pk", "is_active", "is_staff")
+            .first()
+        )
+        if fields is None:
+            raise AuthenticationFailed("유저를 찾을 수 없습니다.", code="user_not_found")
+        cache.set(_user_key(user_pk), fields, settings.AUTH_USER_CACHE_TIMEOUT)
+    if not fields["is_active"]:
+        raise AuthenticationFailed("비활성화된 유저입니다.", code="user_inactive")
+    return fields
+
+
+class ClaimsUser(LazyObject):
+    # 토큰 클레임(pk, nickname, is_staff)은 바로 답하고
+    # 그 외 필드를 쓰거나 ORM 에 넘길 때만 실제 User 를 읽어온다
+    is_active = True
+    is_anonymous = False
+    is_authenticated = True
+
+    def __init__(self, token, **fields):
+        self.__dict__["_claims"] = {
+            "pk": token[api_settings.USER_ID_CLAIM],
+            "id": token[api_settings.USER_ID_CLAIM],
+            "nickname": token.get("nickname"),
+            "is_staff": token.get("is_staff"),
+            **fields,
+        }
+        super().__init__()
+
+    def _setup(self):
+        try:
+            user = get_user_model().objects.get(pk=self._claims["pk"])
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed("유저를 찾을 수 없습니다.", code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed("비활성화된 유저입니다.", code="user_inactive")
+        self._wrapped = user
+
+    def __getattr__(self, name):
+        claims = self.__dict__["_claims"]
+        if claims.get(name) is not None:
+            return claims[name]
+        return super().__getattr__(name)
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, (ClaimsUser, get_user_model())):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    # 조회 요청은 User 를 조회하지 않고 토큰 클레임으로 request.user 를 만든다
+    # 쓰기 요청은 탈퇴 / 비활성화된 유저의 토큰을 만료 전에도 막기 위해 User 를 읽어 확인한다
+    # (is_staff 도 토큰 클레임 대신 읽어온 값을 쓴다)
+    def authenticate(self, request):
+        user_auth = super().authenticate(request)
+        if user_auth is None or request.method in SAFE_METHODS:
+            return user_auth
+        user, token = user_auth
+        fields = load_user(user.pk)
+        return ClaimsUser(token, is_staff=fields["is_staff"]), token
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("토큰에 유저 정보가 없습니다.")
+        return ClaimsUser(validated_token)
@@ -0,0 +1,94 @@
+import hashlib
+import threading
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+GENERATION_KEY = "jwt:blacklist:generation"
+
+
+class BloomFilter:
+    def __init__(self, bits, hashes):
+        self.bits = bits
+        self.hashes = hashes
+        self.array = bytearray((bits + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(
+            self.array[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class TokenBlacklist:
+    # 프로세스마다 블랙리스트 jti 의 블룸 필터를 들고 있다가
+    # 필터에 없으면 DB 조회 없이 통과, 있을 때만 DB 로 확인한다
+    # 다른 프로세스의 블랙리스트 추가는 캐시의 세대 값이 바뀌면 증분으로 읽어온다
+    # 캐시가 프로세스별 (LocMem) 이면 세대 값이 공유되지 않으므로
+    # JWT_BLACKLIST_SYNC_INTERVAL 초마다 세대 값과 상관없이 증분으로 다시 읽는다
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+        self.generation = None
+        self.synced_at = None
+
+    def _load(self, since=None):
+        tokens = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        if since is not None:
+            tokens = tokens.filter(blacklisted_at__gte=since)
+        for jti in tokens.values_list("token__jti", flat=True).iterator():
+            self.filter.add(jti)
+
+    def _sync(self):
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            cache.add(GENERATION_KEY, uuid4().hex, None)
+            generation = cache.get(GENERATION_KEY)
+        if (
+            self.filter is not None
+            and generation == self.generation
+            and timezone.now() - self.synced_at
+            < timedelta(seconds=settings.JWT_BLACKLIST_SYNC_INTERVAL)
+        ):
+            return
+        with self.lock:
+            started = timezone.now()
+            if self.filter is None:
+                self.filter = BloomFilter(
+                    settings.JWT_BLACKLIST_BLOOM_BITS,
+                    settings.JWT_BLACKLIST_BLOOM_HASHES,
+                )
+                self._load()
+            else:
+                # 트랜잭션 커밋 지연을 감안해 마지막 동기화보다 조금 앞부터 다시 읽는다
+                self._load(self.synced_at - timedelta(minutes=1))
+            self.generation = generation
+            self.synced_at = started
+
+    def contains(self, jti):
+        self._sync()
+        if jti not in self.filter:
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def add(self, jti):
+        self._sync()
+        self.filter.add(jti)
+        cache.set(GENERATION_KEY, uuid4().hex, None)
+
+
+blacklist = TokenBlacklist()
@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from articles.pagination import cursor_int, decode_cursor, encode_cursor
+from config.db import insert_ignore
+
+# User.followers 의 through 테이블 (from_user 가 to_user 를 팔로우)
+# 모든 조회는 through 테이블의 (from_user, to_user) 유니크 인덱스나
+# from_user / to_user 외래키 인덱스만 타도록 한다
+Follow = get_user_model().followers.through
+
+
+def follows(user_pk, target_pk):
+    return Follow.objects.filter(from_user=user_pk, to_user=target_pk).exists()
+
+
+def _both_ways(user_pk, target_pk):
+    return Follow.objects.filter(
+        Q(from_user=user_pk, to_user=target_pk)
+        | Q(from_user=target_pk, to_user=user_pk)
+    )
+
+
+def is_mutual(user_pk, target_pk):
+    return _both_ways(user_pk, target_pk).count() == 2
+
+
+async def ais_mutual(user_pk, target_pk):
+    return await _both_ways(user_pk, target_pk).acount() == 2
+
+
+def add_follow(user_pk, target_pk):
+    # 팔로우하고 새로 추가한 행 수 (0 / 1) 를 돌려준다
+    # (from_user, to_user) 유니크 제약에 맡겨 동시 요청에도 IntegrityError 없이 한 번만 들어간다
+    return insert_ignore(Follow, from_user=user_pk, to_user=target_pk)
+
+
+def remove_follow(user_pk, target_pk):
+    # DELETE 한 번으로 취소하고 지운 행 수 (0 / 1) 를 돌려준다
+    return Follow.objects.filter(from_user=user_pk, to_user=target_pk).delete()[0]
+
+
+def toggle_follow(user_pk, target_pk):
+    # 팔로우 상태면 취소하고 False, 아니면 팔로우하고 True
+    # 동시 토글로 확인한 상태가 바뀌어 있어도 추가 / 삭제는 예외 없이 멱등하게 끝난다
+    if follows(user_pk, target_pk):
+        remove_follow(user_pk, target_pk)
+        return False
+    add_follow(user_pk, target_pk)
+    return True
+
+
+def _page_rows(rows, user_field, cursor, size):
+    # through 테이블 id 역순 (최근 팔로우 순) 키셋 페이지
+    if cursor:
+        (last,), _ = decode_cursor(cursor, (cursor_int,))
+        rows = rows.filter(pk__lt=last)
+    rows = rows.order_by("-pk").values_list("pk", user_field, f"{user_field}__nickname")
+    return rows[: size + 1]
+
+
+def _page_result(rows, size):
+    next_cursor = encode_cursor([rows[size - 1][0]]) if len(rows) > size else None
+    return {
+        "next": next_cursor,
+        "results": [
+            {"pk": pk, "nickname": nickname} for _, pk, nickname in rows[:size]
+        ],
+    }
+
+
+def _followers_rows(user_pk, cursor, size):
+    return _page_rows(Follow.objects.filter(from_user=user_pk), "to_user", cursor, size)
+
+
+def _followees_rows(user_pk, cursor, size):
+    return _page_rows(Follow.objects.filter(to_user=user_pk), "from_user", cursor, size)
+
+
+# user.followers (user 가 팔로우하는 유저) 페이지
+def followers_page(user_pk, cursor=None, size=20):
+    return _page_result(list(_followers_rows(user_pk, cursor, size)), size)
+
+
+# user.followees (user 를 팔로우하는 유저) 페이지
+def followees_page(user_pk, cursor=None, size=20):
+    return _page_result(list(_followees_rows(user_pk, cursor, size)), size)
+
+
+async def afollowers_page(user_pk, cursor=None, size=20):
+    rows = [row async for row in _followers_rows(user_pk, cursor, size)]
+    return _page_result(rows, size)
+
+
+async def afollowees_page(user_pk, cursor=None, size=20):
+    rows = [row async for row in _followees_rows(user_pk, cursor, size)]
+    return _page_result(rows, size)
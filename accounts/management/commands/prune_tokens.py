@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+
+class Command(BaseCommand):
+    help = "만료된 OutstandingToken / BlacklistedToken 을 나눠서 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="한 번의 DELETE 로 지울 토큰 수",
+        )
+
+    def handle(self, *args, batch_size, **options):
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lte=now)
+        deleted = 0
+        # 짧은 트랜잭션 여러 번으로 나눠 긴 쓰기 잠금을 피한다
+        while True:
+            pks = list(expired.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            with transaction.atomic():
+                BlacklistedToken.objects.filter(token_id__in=pks).delete()
+                OutstandingToken.objects.filter(pk__in=pks).delete()
+            deleted += len(pks)
+        self.stdout.write(self.style.SUCCESS(f"만료 토큰 {deleted}개 삭제 완료."))
@@ -1,5 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer,
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from .tokens import RefreshToken
 
 
 class UserInfoSerializer(serializers.ModelSerializer):
@@ -40,23 +46,38 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return get_user_model().objects.create_user(**validated_data)
 
 
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RefreshToken
+
+    # 자주 쓰는 유저 정보를 토큰에 넣어 인증 시 DB 조회를 생략할 수 있게 한다
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["nickname"] = user.nickname
+        token["is_staff"] = user.is_staff
+        return token
+
+
+class FastTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RefreshToken
+
+
+class FastTokenBlacklistSerializer(TokenBlacklistSerializer):
+    token_class = RefreshToken
+
+
 class FollowListSerializer(serializers.Serializer):
     pk = serializers.IntegerField()
     nickname = serializers.CharField()
     followers = serializers.SerializerMethodField()
     followees = serializers.SerializerMethodField()
 
+    # 팔로우 목록은 뷰에서 페이지 단위로 만들어 context 로 넘긴다
     def get_followers(self, obj):
-        return [
-            {"pk": follower.pk, "nickname": follower.nickname}
-            for follower in obj.followers.all()
-        ]
+        return self.context["followers"]
 
     def get_followees(self, obj):
-        return [
-            {"pk": followee.pk, "nickname": followee.nickname}
-            for followee in obj.followees.all()
-        ]
+        return self.context["followees"]
 
     class Meta:
         model = get_user_model()
@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .authentication import forget_user
+from .blacklist import blacklist
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def add_to_blacklist(sender, instance, created, **kwargs):
+    if created:
+        jti = instance.token.jti
+        transaction.on_commit(lambda: blacklist.add(jti))
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def forget_cached_user(sender, instance, **kwargs):
+    # 비활성화 / 탈퇴가 인증 캐시 TTL 을 기다리지 않고 바로 반영되도록
+    forget_user(instance.pk)
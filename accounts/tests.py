@@ -1,3 +1,229 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework.test import APITestCase
+
+from articles.models import Article, TimelineEntry
+from articles.tests import create_user
+from config.testing import QueryBudgetMixin
+from .authentication import _user_key
+from .blacklist import BloomFilter, TokenBlacklist
+from .tokens import RefreshToken
+
+
+class AccountsQueryBudgetTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("user")
+        cls.other = create_user("other")
+        cls.user.followers.add(cls.other)
+        cls.other.followers.add(cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, user):
+        response = self.client.post(
+            "/accounts/api/token/", {"username": user.username, "password": "password"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return response.data
+
+    def test_user(self):
+        response = self.client.post(
+            "/accounts/user/",
+            {
+                "username": "new",
+                "email": "new@example.com",
+                "password": "password",
+                "fullname": "new",
+                "nickname": "new",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        tokens = self.login(self.user)
+        self.assertEqual(self.client.get("/accounts/user/").status_code, 200)
+        response = self.client.delete(
+            "/accounts/user/",
+            {"password": "password", "refresh": tokens["refresh"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 204)
+
+    def test_follow(self):
+        self.login(self.user)
+        url = f"/accounts/{self.other.pk}/follow/"
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.post(url).data["message"], "unfollow!")
+        self.assertEqual(self.client.post(url).data["message"], "follow!")
+        self.assertEqual(
+            self.client.get(f"/accounts/{self.other.pk}/comments/").status_code, 200
+        )
+
+    def test_cold_follow(self):
+        # 인증 / 유명인 캐시가 비어 있는 첫 팔로우는 팔로워 수와 최근 글까지 읽는다
+        self.login(self.user)
+        author = create_user("author")
+        Article.objects.create(author=author, title="제목", content="본문", topic="game")
+        url = f"/accounts/{author.pk}/follow/"
+        for method, message in [
+            ("post", "follow!"),
+            ("post", "unfollow!"),
+            ("put", "follow!"),
+            ("delete", "unfollow!"),
+        ]:
+            cache.clear()
+            response = getattr(self.client, method)(url)
+            self.assertEqual(response.data["message"], message)
+        self.assertFalse(TimelineEntry.objects.filter(user=self.user).exists())
+
+    def test_follow_put_delete(self):
+        self.login(self.user)
+        url = f"/accounts/{self.other.pk}/follow/"
+        # 이미 팔로우 중이므로 바뀌지 않는다
+        self.assertEqual(self.client.put(url).data["affected"], 0)
+        deleted = [self.client.delete(url).data["affected"] for _ in range(2)]
+        self.assertEqual(deleted, [1, 0])
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.put(url).data["affected"], 1)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        own = f"/accounts/{self.user.pk}/follow/"
+        self.assertEqual(self.client.put(own).status_code, 403)
+
+    def test_follow_async(self):
+        url = f"/accounts/{self.other.pk}/follow/async/"
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.login(self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.content,
+            self.client.get(f"/accounts/{self.other.pk}/follow/").content,
+        )
+        self.client.post(f"/accounts/{self.other.pk}/follow/")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        response = self.client.get(f"/accounts/{self.user.pk}/follow/async/")
+        self.assertEqual(response.status_code, 200)
+
+
+class StatelessAuthenticationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        cls.article = Article.objects.create(
+            author=cls.author, title="제목", content="본문", topic="game"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user("user")
+        response = self.client.post(
+            "/accounts/api/token/", {"username": "user", "password": "password"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def write(self):
+        created = self.client.post(
+            "/articles/",
+            {"title": "제목", "content": "본문", "topic": "game"},
+            format="json",
+        )
+        liked = self.client.post(f"/articles/{self.author.pk}/{self.article.pk}/likes/")
+        return created.status_code, liked.status_code
+
+    def test_active_user_can_write(self):
+        self.assertEqual(self.write(), (201, 200))
+
+    def test_inactive_user_cannot_write(self):
+        # 인증 캐시에 올라간 뒤에 비활성화해도 바로 막힌다
+        self.write()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.write(), (401, 401))
+        # 조회는 토큰 클레임만으로 처리한다
+        self.assertEqual(self.client.get("/articles/").status_code, 200)
+
+    def test_deleted_user_cannot_write(self):
+        self.user.delete()
+        self.assertEqual(self.write(), (401, 401))
+        self.assertFalse(Article.objects.exclude(author=self.author).exists())
+
+    def test_cache_holds_only_auth_fields(self):
+        self.write()
+        self.assertEqual(
+            cache.get(_user_key(self.user.pk)),
+            {"pk": self.user.pk, "is_active": True, "is_staff": False},
+        )
+
+
+class TokenBlacklistTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user("user")
+
+    def setUp(self):
+        cache.clear()
+
+    def obtain(self):
+        return self.client.post(
+            "/accounts/api/token/", {"username": "user", "password": "password"}
+        ).data["refresh"]
+
+    def refresh(self, token):
+        return self.client.post("/accounts/api/token/refresh/", {"refresh": token})
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(1 << 12, 5)
+        bloom.add("a")
+        self.assertIn("a", bloom)
+        self.assertNotIn("b", bloom)
+
+    def test_blacklisted_refresh_is_rejected(self):
+        token = self.obtain()
+        self.assertEqual(self.refresh(token).status_code, 200)
+        # 블룸 필터 반영은 블랙리스트 저장이 커밋된 뒤에 한다
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(
+                "/accounts/api/token/blacklist/", {"refresh": token}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.refresh(token).status_code, 401)
+        self.assertEqual(self.refresh(self.obtain()).status_code, 200)
+
+    def test_other_process_is_synced_by_interval(self):
+        # 캐시를 공유하지 않는 다른 프로세스의 필터
+        other = TokenBlacklist()
+        token = RefreshToken(self.obtain())
+        self.assertFalse(other.contains(token["jti"]))
+        # 이 프로세스에서 블랙리스트에 올렸지만 세대 값은 다른 프로세스에 전달되지 않는다
+        with self.captureOnCommitCallbacks(execute=False):
+            token.blacklist()
+        self.assertFalse(other.contains(token["jti"]))
+        other.synced_at -= timedelta(seconds=settings.JWT_BLACKLIST_SYNC_INTERVAL)
+        self.assertTrue(other.contains(token["jti"]))
+
+    def test_prune_tokens(self):
+        expired = RefreshToken(self.obtain())
+        expired.blacklist()
+        OutstandingToken.objects.filter(jti=expired["jti"]).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        live = RefreshToken(self.obtain())
+        live.blacklist()
+        self.obtain()
+        call_command("prune_tokens", batch_size=1, stdout=StringIO())
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertEqual(
+            list(BlacklistedToken.objects.values_list("token__jti", flat=True)),
+            [live["jti"]],
+        )
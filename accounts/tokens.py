@@ -0,0 +1,13 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from .blacklist import blacklist
+
+
+class RefreshToken(BaseRefreshToken):
+    # 블랙리스트 확인을 블룸 필터로 먼저 걸러 대부분의 refresh 에서 DB 조회를 생략
+    def check_blacklist(self):
+        if blacklist.contains(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
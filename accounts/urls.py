@@ -6,8 +6,8 @@ from rest_framework_simplejwt.views import (
 
 from django.urls import path
 
-from articles.views import ArticleListAPI, CommentAPI
-from .views import FollowAPI, UserAPI
+from articles.views import ArticleListAPI, CommentAPI, TimelineAPI
+from .views import FollowAPI, FollowAsyncAPI, UserAPI
 
 urlpatterns = [
     # 정보조회 / 회원가입 / 회원탈퇴
@@ -19,6 +19,10 @@ urlpatterns = [
     path("api/token/blacklist/", TokenBlacklistView.as_view(), name="token_blacklist"),
     # 팔로우 기능 / 팔로우 조회
     path("<int:pk>/follow/", FollowAPI.as_view(), name="follow"),
+    # 팔로우 조회 (async, ASGI 용)
+    path("<int:pk>/follow/async/", FollowAsyncAPI.as_view(), name="follow_async"),
+    # 팔로우한 유저들의 게시글 타임라인
+    path("timeline/", TimelineAPI.as_view(), name="timeline"),
     # 유저 게시글 조회
     path("<int:pk>/articles/", ArticleListAPI.as_view(), name="articles"),
     # 댓글 조회
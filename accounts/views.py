@@ -1,16 +1,37 @@
+import asyncio
+
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.generics import get_object_or_404
 from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
 from .serializers import FollowListSerializer, UserCreateSerializer, UserInfoSerializer
 from django.contrib.auth import get_user_model, authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.db.models import Prefetch
+from .tokens import RefreshToken
 from drf_yasg.utils import swagger_auto_schema
+from django.conf import settings
+from django.db import transaction
+from articles import timeline
+from articles.pagination import KeysetPagination
+from config.routers import ReplicaReadMixin
+from config.async_views import AsyncAPIView
+from articles import write_behind
+from .follow_graph import (
+    add_follow,
+    afollowees_page,
+    afollowers_page,
+    followees_page,
+    followers_page,
+    remove_follow,
+    toggle_follow,
+)
 
 
 class UserAPI(APIView):
+    query_budget = {"GET": 1, "POST": 4, "DELETE": 24}
+    throttle_scopes = {"POST": "signup"}
+
     # 정보 조회
     def get(self, request, format=None):
         if not request.user.is_authenticated:
@@ -49,43 +70,111 @@ class UserAPI(APIView):
             return Response({"detail": "비밀번호 불일치."}, status=status.HTTP_403_FORBIDDEN)
 
 
-class FollowAPI(APIView):
+class FollowAPI(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
+    # 첫 팔로우는 상대가 팔로워가 많은 유저인지 세고 최근 글로 타임라인을 채운다
+    query_budget = {"GET": 4, "POST": 9, "PUT": 8, "DELETE": 7}
+    throttle_scopes = {"POST": "follow", "PUT": "follow", "DELETE": "follow"}
+
+    def get_target(self, request, pk):
+        target = get_object_or_404(get_user_model().objects.only("pk"), pk=pk)
+        if target.pk == request.user.pk:
+            raise PermissionDenied("권한이 없습니다.")
+        return target
 
     # 유저의 팔로우 조회
     def get(self, request, pk, format=None):
-        target = get_object_or_404(
-            get_user_model().objects.prefetch_related(
-                Prefetch(
-                    "followers", queryset=get_user_model().objects.only("nickname")
+        target = get_object_or_404(get_user_model().objects.only("nickname"), pk=pk)
+        user = request.user
+        # 맞팔로우일 때만 조회 가능
+        if target.pk != user.pk and not write_behind.is_mutual(user.pk, target.pk):
+            return Response({"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
+        size = KeysetPagination().get_page_size(request)
+        serializer = FollowListSerializer(
+            target,
+            context={
+                "followers": followers_page(
+                    target.pk, request.query_params.get("followers_cursor"), size
                 ),
-                Prefetch(
-                    "followees", queryset=get_user_model().objects.only("nickname")
+                "followees": followees_page(
+                    target.pk, request.query_params.get("followees_cursor"), size
                 ),
-            ),
-            pk=pk,
+            },
         )
-        user = request.user
-        # 맞팔로우일 때만 조회 가능
-        if target != user:
-            if (target in user.followers.all()) and (user in target.followers.all()):
-                pass
-            else:
-                return Response(
-                    {"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN
-                )
-        serializer = FollowListSerializer(target)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     # 팔로우 하기 / 취소
     def post(self, request, pk, format=None):
-        target = get_object_or_404(get_user_model(), pk=pk)
+        target = self.get_target(request, pk)
         user = request.user
-        if target == user:
-            return Response({"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
-        if target in user.followers.all():
-            user.followers.remove(target)
-            return Response({"message": "unfollow!"}, status=status.HTTP_200_OK)
+        if settings.WRITE_BEHIND:
+            # 팔로우 반영과 타임라인 채우기 / 정리는 대기열을 비울 때 한다
+            followed = write_behind.toggle_follow(user.pk, target.pk)
         else:
-            user.followers.add(target)
+            with transaction.atomic():
+                followed = toggle_follow(user.pk, target.pk)
+                if followed:
+                    timeline.backfill(user.pk, target.pk)
+                else:
+                    timeline.prune(user.pk, target.pk)
+        if followed:
             return Response({"message": "follow!"}, status=status.HTTP_200_OK)
+        else:
+            return Response({"message": "unfollow!"}, status=status.HTTP_200_OK)
+
+    # 팔로우 하기 (이미 팔로우 상태면 그대로 두고 affected 0)
+    def put(self, request, pk, format=None):
+        target = self.get_target(request, pk)
+        user = request.user
+        if settings.WRITE_BEHIND:
+            affected = int(write_behind.set_follow(user.pk, target.pk, True))
+        else:
+            with transaction.atomic():
+                affected = add_follow(user.pk, target.pk)
+                if affected:
+                    timeline.backfill(user.pk, target.pk)
+        return Response(
+            {"message": "follow!", "affected": affected}, status=status.HTTP_200_OK
+        )
+
+    # 팔로우 취소 (팔로우 상태가 아니면 affected 0)
+    def delete(self, request, pk, format=None):
+        target = self.get_target(request, pk)
+        user = request.user
+        if settings.WRITE_BEHIND:
+            affected = int(write_behind.set_follow(user.pk, target.pk, False))
+        else:
+            with transaction.atomic():
+                affected = remove_follow(user.pk, target.pk)
+                if affected:
+                    timeline.prune(user.pk, target.pk)
+        return Response(
+            {"message": "unfollow!", "affected": affected}, status=status.HTTP_200_OK
+        )
+
+
+class FollowAsyncAPI(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+    replica_methods = ("GET",)
+    query_budget = {"GET": 4}
+
+    # 유저의 팔로우 조회 (async)
+    # 맞팔로우 확인과 팔로우 / 팔로워 목록 조회를 동시에 실행하고, 맞팔로우가 아니면 목록은 버린다
+    async def get(self, request, pk):
+        user = request.user
+        size = KeysetPagination().get_page_size(request)
+        queries = [
+            get_user_model().objects.only("nickname").aget(pk=pk),
+            afollowers_page(pk, request.query_params.get("followers_cursor"), size),
+            afollowees_page(pk, request.query_params.get("followees_cursor"), size),
+        ]
+        if pk != user.pk:
+            queries.append(write_behind.ais_mutual(user.pk, pk))
+        target, followers, followees, *mutual = await asyncio.gather(*queries)
+        # 맞팔로우일 때만 조회 가능
+        if mutual and not mutual[0]:
+            raise PermissionDenied("권한이 없습니다.")
+        serializer = FollowListSerializer(
+            target, context={"followers": followers, "followees": followees}
+        )
+        return self.render(serializer.data)
@@ -0,0 +1,112 @@
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+LISTING_VERSION_KEY = "articles:listing:version"
+
+
+# 게시글 상세 응답 캐시
+# 버전 토큰이 바뀌면 이전 버전 키의 응답은 더 이상 읽히지 않는다
+def _version_key(article_pk):
+    return f"article:{article_pk}:version"
+
+
+def _detail_key(article_pk, version):
+    return f"article:{article_pk}:{version}:detail"
+
+
+def _written_key(article_pk):
+    return f"article:{article_pk}:written"
+
+
+def _new_version():
+    # 만든 시각 (ms) 을 앞에 붙여 두어 Last-Modified 로도 쓴다
+    return f"{time.time_ns() // 1_000_000:x}.{uuid4().hex}"
+
+
+def version_timestamp(version):
+    # 버전 토큰을 만든 시각 (초)
+    if "." not in version:
+        return None
+    return int(version.split(".", 1)[0], 16) // 1000
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # 캐시에서 밀려났어도 예전 토큰을 재사용하지 않도록 항상 새 토큰을 만든다
+        version = _new_version()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+async def _aget_version(key):
+    version = await cache.aget(key)
+    if version is None:
+        version = _new_version()
+        if not await cache.aadd(key, version, None):
+            version = await cache.aget(key, version)
+    return version
+
+
+def get_version(article_pk):
+    return _get_version(_version_key(article_pk))
+
+
+async def aget_version(article_pk):
+    return await _aget_version(_version_key(article_pk))
+
+
+def bump_version(article_pk):
+    cache.set(_version_key(article_pk), _new_version(), None)
+
+
+# 게시글 목록 버전 토큰
+# 어떤 게시글이든 좋아요 / 댓글 수가 바뀌거나 삭제되면 올라가 목록 ETag 를 바꾼다
+def get_listing_version():
+    return _get_version(LISTING_VERSION_KEY)
+
+
+def bump_listing_version():
+    cache.set(LISTING_VERSION_KEY, _new_version(), None)
+
+
+def invalidate_article(article_pk):
+    # 커밋 전에 읽힌 이전 데이터가 새 버전으로 저장되지 않도록 커밋 후에 올린다
+    def invalidate():
+        bump_version(article_pk)
+        bump_listing_version()
+        cache.set(_written_key(article_pk), True, settings.REPLICA_LAG)
+
+    transaction.on_commit(invalidate)
+
+
+def recently_written(article_pk):
+    # 복제 지연 안에 바뀐 게시글은 replica 가 예전 데이터를 줄 수 있다
+    return cache.get(_written_key(article_pk), False)
+
+
+async def arecently_written(article_pk):
+    return await cache.aget(_written_key(article_pk), False)
+
+
+def get_article_detail(article_pk, version):
+    return cache.get(_detail_key(article_pk, version))
+
+
+async def aget_article_detail(article_pk, version):
+    return await cache.aget(_detail_key(article_pk, version))
+
+
+def set_article_detail(article_pk, version, payload):
+    cache.set(_detail_key(article_pk, version), payload, settings.ARTICLE_CACHE_TIMEOUT)
+
+
+async def aset_article_detail(article_pk, version, payload):
+    await cache.aset(
+        _detail_key(article_pk, version), payload, settings.ARTICLE_CACHE_TIMEOUT
+    )
@@ -0,0 +1,50 @@
+import hashlib
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_listing_version, version_timestamp
+
+
+def make_etag(*parts):
+    # 본문을 직렬화하지 않고 응답 내용을 결정하는 값들로 강한 ETag 를 만든다
+    raw = "|".join(str(part) for part in parts).encode()
+    return quote_etag(hashlib.blake2b(raw, digest_size=16).hexdigest())
+
+
+def detail_validators(article_pk, version):
+    # 상세 응답은 게시글 버전 토큰이 바뀔 때만 바뀐다 (캐시만 읽음)
+    return make_etag("article", article_pk, version), version_timestamp(version)
+
+
+def listing_validators(request, articles):
+    # 목록 응답은 (경로와 쿼리, 가장 최근 updated_at, 목록 버전 토큰) 으로 정해진다
+    # Max() 집계 대신 (…, updated_at, id) 인덱스의 첫 행만 읽는다
+    latest = (
+        articles.order_by("-updated_at", "-pk")
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    version = get_listing_version()
+    moments = [version_timestamp(version)]
+    if latest is not None:
+        aware = timezone.make_aware(latest) if timezone.is_naive(latest) else latest
+        moments.append(int(aware.timestamp()))
+    last_modified = max(filter(None, moments), default=None)
+    return make_etag(request.get_full_path(), latest, version), last_modified
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def not_modified(request, etag, last_modified):
+    # If-None-Match (있으면 우선) / If-Modified-Since 가 맞으면 304 응답, 아니면 None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
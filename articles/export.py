@@ -0,0 +1,127 @@
+import csv
+from datetime import datetime
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from config.renderers import FastJSONRenderer
+from .models import TOPIC_CHOICES, Article, Comment
+
+ARTICLE_COLUMNS = (
+    "pk",
+    "author_id",
+    "title",
+    "content",
+    "topic",
+    "likes_count",
+    "comments_count",
+    "created_at",
+    "updated_at",
+)
+COMMENT_COLUMNS = ("pk", "article_id", "author_id", "content", "created_at")
+# CSV 는 게시글 / 댓글 행을 type 컬럼으로 구분해 한 파일에 쓴다
+CSV_COLUMNS = ("type",) + tuple(dict.fromkeys(ARTICLE_COLUMNS + COMMENT_COLUMNS))
+OUTPUTS = ("ndjson", "csv")
+
+
+def parse_moment(value):
+    # "2023-09-01" 또는 "2023-09-01T12:00:00" 형식
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime(day.year, day.month, day.day)
+    return moment
+
+
+def format_moment(value):
+    # NDJSON / CSV 가 같은 시각 문자열을 쓰도록 오프셋을 붙인 ISO 8601 로 통일한다
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value.isoformat()
+
+
+def _formatted(row):
+    return {
+        column: format_moment(value) if isinstance(value, datetime) else value
+        for column, value in row.items()
+    }
+
+
+def export_queryset(since=None, until=None, topic=None):
+    articles = Article.objects.all()
+    if since:
+        articles = articles.filter(updated_at__gte=since)
+    if until:
+        articles = articles.filter(updated_at__lt=until)
+    if topic and topic != "all":
+        if topic not in dict(TOPIC_CHOICES):
+            raise ValueError(topic)
+        articles = articles.filter(topic=topic)
+    return articles
+
+
+def export_rows(articles, comments=False, chunk_size=2000):
+    # 게시글은 pk 순, 댓글은 (article, created_at, id) 인덱스 순으로 각각 iterator 로 읽어
+    # 게시글마다 그 댓글을 이어 붙인다 (두 스트림 모두 게시글 pk 오름차순이라 한 번씩만 훑는다)
+    rows = articles.order_by("pk").values(*ARTICLE_COLUMNS).iterator(chunk_size)
+    if not comments:
+        for row in rows:
+            yield "article", row
+        return
+    comment_rows = (
+        Comment.objects.filter(article__in=articles.values("pk"))
+        .order_by("article_id", "created_at", "pk")
+        .values(*COMMENT_COLUMNS)
+        .iterator(chunk_size)
+    )
+    comment = next(comment_rows, None)
+    for row in rows:
+        yield "article", row
+        while comment is not None and comment["article_id"] <= row["pk"]:
+            if comment["article_id"] == row["pk"]:
+                yield "comment", comment
+            comment = next(comment_rows, None)
+
+
+def _batched(lines, size):
+    # 한 줄씩 내보내면 응답 write 호출이 너무 많아 size 줄씩 묶어서 내보낸다
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield b"".join(batch)
+            batch = []
+    if batch:
+        yield b"".join(batch)
+
+
+def to_ndjson(rows, batch_size=500):
+    renderer = FastJSONRenderer()
+    return _batched(
+        (
+            renderer.render({"type": kind, **_formatted(row)}) + b"\n"
+            for kind, row in rows
+        ),
+        batch_size,
+    )
+
+
+class _Line:
+    # csv.writer 가 쓴 한 줄을 그대로 돌려받기 위한 버퍼
+    def write(self, value):
+        return value
+
+
+def to_csv(rows, batch_size=500):
+    writer = csv.writer(_Line())
+
+    def lines():
+        yield writer.writerow(CSV_COLUMNS).encode()
+        for kind, row in rows:
+            row = _formatted(row)
+            values = [kind] + [row.get(column) for column in CSV_COLUMNS[1:]]
+            yield writer.writerow(values).encode()
+
+    return _batched(lines(), batch_size)
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    check_password,
+    identify_hasher,
+)
+
+COMMENT_HASHER = "comment_pbkdf2_sha256"
+
+
+class CommentPasswordHasher(PBKDF2PasswordHasher):
+    # 익명 댓글 비밀번호 전용 해셔
+    # 계정 비밀번호와 분리해 반복 횟수를 COMMENT_PASSWORD_ITERATIONS 로 따로 조절한다
+    # PASSWORD_HASHERS 에 넣지 않고 직접 호출해서 계정 비밀번호 확인에는 쓰이지 않게 한다
+    algorithm = COMMENT_HASHER
+
+    @property
+    def iterations(self):
+        return settings.COMMENT_PASSWORD_ITERATIONS
+
+
+comment_hasher = CommentPasswordHasher()
+
+
+def identify_comment_hasher(encoded):
+    # 전용 해셔 해시가 아니면 전용 해셔 이전에 기본 해셔로 만든 해시
+    if encoded.startswith(f"{COMMENT_HASHER}$"):
+        return comment_hasher
+    return identify_hasher(encoded)
+
+
+def make_comment_password(raw_password):
+    return comment_hasher.encode(raw_password, comment_hasher.salt())
+
+
+def check_comment_password(raw_password, comment):
+    # 기존 해시(기본 해셔 / 다른 반복 횟수)는 확인에 성공하면 전용 해셔로 다시 저장
+    encoded = comment.password or ""
+    if encoded.startswith(f"{COMMENT_HASHER}$"):
+        valid = comment_hasher.verify(raw_password, encoded)
+        must_update = valid and comment_hasher.must_update(encoded)
+    else:
+        valid = must_update = check_password(raw_password, encoded)
+    if must_update:
+        comment.password = make_comment_password(raw_password)
+        type(comment).objects.filter(pk=comment.pk).update(password=comment.password)
+    return valid
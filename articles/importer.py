@@ -0,0 +1,273 @@
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.follow_graph import Follow
+from .cache import bump_listing_version
+from .export import parse_moment
+from .hashers import identify_comment_hasher, make_comment_password
+from .models import Article, Comment
+
+User = get_user_model()
+Like = Article.likes.through
+RECORD_TYPES = ("user", "article", "comment", "follow", "like")
+UNIQUE_USER_FIELDS = ("username", "email", "nickname")
+
+
+@contextmanager
+def source_timestamps(*models):
+    # auto_now / auto_now_add 가 원본 시각을 덮어쓰지 않도록 가져오는 동안만 끈다
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _moment(value, default):
+    return parse_moment(value) if value else default
+
+
+def _password(record, make=make_password, identify=identify_hasher):
+    # password_hash 는 미리 해시된 값 그대로 (지원하는 해셔인지만 확인), password 는 해시해서 저장
+    if record.get("password_hash"):
+        identify(record["password_hash"])
+        return record["password_hash"]
+    if record.get("password"):
+        return make(record["password"])
+    return None
+
+
+class ForumImporter:
+    # JSONL 레코드를 청크 단위로 검증해 bulk_create 한다
+    # 원본 id 를 그대로 pk 로 쓰고, 외래키는 메모리의 유저 / 게시글 pk 집합으로 확인한다
+    def __init__(self, batch_size=1000, on_error=None):
+        self.batch_size = batch_size
+        self.on_error = on_error
+        self.user_ids = set(User.objects.values_list("pk", flat=True).iterator())
+        self.article_ids = set(Article.objects.values_list("pk", flat=True).iterator())
+        self.created = defaultdict(int)
+        self.skipped = 0
+        self.errors = 0
+
+    def error(self, lineno, message):
+        self.errors += 1
+        if self.on_error:
+            self.on_error(lineno, message)
+
+    def import_chunk(self, records):
+        by_type = defaultdict(list)
+        for lineno, record in records:
+            if record.get("type") not in RECORD_TYPES:
+                self.error(lineno, f"알 수 없는 type: {record.get('type')!r}")
+                continue
+            by_type[record["type"]].append((lineno, record))
+        # 청크 안에서도 참조되는 쪽(유저 -> 게시글 -> 댓글 / 팔로우 / 좋아요)부터 넣는다
+        with transaction.atomic():
+            self.import_users(by_type["user"])
+            self.import_articles(by_type["article"])
+            touched = self.import_comments(by_type["comment"])
+            self.import_follows(by_type["follow"])
+            touched |= self.import_likes(by_type["like"])
+            if touched:
+                Article.objects.filter(pk__in=touched).recount()
+
+    def _existing(self, model, pks):
+        return set(model.objects.filter(pk__in=pks).values_list("pk", flat=True))
+
+    def _build(self, records, build, exclude):
+        objects = []
+        for lineno, record in records:
+            try:
+                obj = build(record)
+                obj.clean_fields(exclude=exclude)
+            except ValidationError as exc:
+                self.error(lineno, "; ".join(exc.messages))
+            except (KeyError, TypeError, ValueError) as exc:
+                self.error(lineno, f"잘못된 레코드: {exc!r}")
+            else:
+                objects.append((lineno, obj))
+        return objects
+
+    def _insert(self, model, objects):
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.created[model._meta.model_name] += len(objects)
+
+    def import_users(self, records):
+        now = timezone.now()
+
+        def build(record):
+            return User(
+                pk=int(record["id"]),
+                username=User.normalize_username(record["username"]).lower(),
+                email=User.objects.normalize_email(record["email"]),
+                nickname=User.normalize_username(record["nickname"]).lower(),
+                fullname=record["fullname"],
+                birthday=record.get("birthday"),
+                is_staff=bool(record.get("is_staff", False)),
+                is_active=bool(record.get("is_active", True)),
+                join_date=_moment(record.get("join_date"), now),
+                password=_password(record) or make_password(None),
+            )
+
+        users = self._build(records, build, ["password", "last_login"])
+        if not users:
+            return
+        existing = self._existing(User, [user.pk for _, user in users])
+        # username / email / nickname 유니크 검사는 청크 단위 쿼리 한 번씩
+        taken = {
+            field: set(
+                User.objects.filter(
+                    **{f"{field}__in": [getattr(user, field) for _, user in users]}
+                ).values_list(field, flat=True)
+            )
+            for field in UNIQUE_USER_FIELDS
+        }
+        new = []
+        for lineno, user in users:
+            if user.pk in existing:
+                self.skipped += 1
+                continue
+            duplicate = [f for f in UNIQUE_USER_FIELDS if getattr(user, f) in taken[f]]
+            if duplicate:
+                self.error(lineno, f"이미 사용 중인 {', '.join(duplicate)}")
+                continue
+            for field in UNIQUE_USER_FIELDS:
+                taken[field].add(getattr(user, field))
+            existing.add(user.pk)
+            new.append(user)
+        self._insert(User, new)
+        self.user_ids.update(user.pk for user in new)
+
+    def import_articles(self, records):
+        now = timezone.now()
+
+        def build(record):
+            if int(record["author"]) not in self.user_ids:
+                raise ValueError(f"없는 유저 {record['author']}")
+            created_at = _moment(record.get("created_at"), now)
+            return Article(
+                pk=int(record["id"]),
+                author_id=int(record["author"]),
+                title=record["title"],
+                content=record["content"],
+                topic=record["topic"],
+                created_at=created_at,
+                updated_at=_moment(record.get("updated_at"), created_at),
+            )
+
+        articles = self._build(records, build, ["author", "likes"])
+        existing = self._existing(Article, [article.pk for _, article in articles])
+        new = []
+        for _, article in articles:
+            if article.pk in existing:
+                self.skipped += 1
+                continue
+            existing.add(article.pk)
+            new.append(article)
+        self._insert(Article, new)
+        self.article_ids.update(article.pk for article in new)
+
+    def import_comments(self, records):
+        now = timezone.now()
+
+        def build(record):
+            article = int(record["article"])
+            author = int(record["author"]) if record.get("author") else None
+            if article not in self.article_ids:
+                raise ValueError(f"없는 게시글 {record['article']}")
+            if author is not None and author not in self.user_ids:
+                raise ValueError(f"없는 유저 {record['author']}")
+            password = None
+            if author is None:
+                password = _password(
+                    record, make_comment_password, identify_comment_hasher
+                )
+                if password is None:
+                    raise ValueError("익명 댓글에는 비밀번호가 필요합니다")
+            return Comment(
+                pk=int(record["id"]),
+                article_id=article,
+                author_id=author,
+                content=record["content"],
+                password=password,
+                created_at=_moment(record.get("created_at"), now),
+            )
+
+        comments = self._build(records, build, ["article", "author", "password"])
+        existing = self._existing(Comment, [comment.pk for _, comment in comments])
+        new = []
+        for _, comment in comments:
+            if comment.pk in existing:
+                self.skipped += 1
+                continue
+            existing.add(comment.pk)
+            new.append(comment)
+        self._insert(Comment, new)
+        return {comment.article_id for comment in new}
+
+    def _pairs(self, records, first, second, first_ids, second_ids):
+        pairs = {}
+        for lineno, record in records:
+            try:
+                pair = (int(record[first]), int(record[second]))
+            except (KeyError, TypeError, ValueError) as exc:
+                self.error(lineno, f"잘못된 레코드: {exc!r}")
+                continue
+            if pair[0] not in first_ids or pair[1] not in second_ids:
+                self.error(lineno, f"없는 {first} / {second}: {pair}")
+                continue
+            pairs[pair] = lineno
+        return list(pairs)
+
+    def import_follows(self, records):
+        # (follower, followee): follower 가 followee 를 팔로우
+        pairs = self._pairs(
+            records, "follower", "followee", self.user_ids, self.user_ids
+        )
+        Follow.objects.bulk_create(
+            [
+                Follow(from_user_id=follower, to_user_id=followee)
+                for follower, followee in pairs
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        self.created["follow"] += len(pairs)
+
+    def import_likes(self, records):
+        pairs = self._pairs(records, "user", "article", self.user_ids, self.article_ids)
+        Like.objects.bulk_create(
+            [Like(user_id=user, article_id=article) for user, article in pairs],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        self.created["like"] += len(pairs)
+        return {article for _, article in pairs}
+
+    def finish(self):
+        # 원본 id 를 pk 로 넣었으므로 시퀀스를 최대 pk 뒤로 맞춘다 (PostgreSQL 등)
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [User, Article, Comment]
+        )
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+        # 가져온 게시글은 updated_at 이 원본 시각이라 목록 ETag 가 바뀌도록 버전을 올린다
+        bump_listing_version()
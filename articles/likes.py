@@ -0,0 +1,41 @@
+from django.db.models import F
+
+from config.db import insert_ignore
+from . import trending
+from .cache import invalidate_article
+from .models import Article
+
+Like = Article.likes.through
+
+
+def _changed(article, delta):
+    Article.objects.filter(pk=article.pk).update(likes_count=F("likes_count") + delta)
+    invalidate_article(article.pk)
+    trending.like(article, delta)
+
+
+def add_like(article, user_pk):
+    # 좋아요하고 새로 추가한 행 수 (0 / 1) 를 돌려준다
+    # (article, user) 유니크 제약에 맡겨 동시 요청에도 한 번만 들어가고
+    # 실제로 추가했을 때만 좋아요 수 / 캐시 / 인기 점수를 바꾼다
+    added = insert_ignore(Like, article=article.pk, user=user_pk)
+    if added:
+        _changed(article, 1)
+    return added
+
+
+def remove_like(article, user_pk):
+    # DELETE 한 번으로 취소하고 지운 행 수 (0 / 1) 를 돌려준다
+    removed = Like.objects.filter(article=article.pk, user=user_pk).delete()[0]
+    if removed:
+        _changed(article, -1)
+    return removed
+
+
+def toggle_like(article, user_pk):
+    # 좋아요 상태면 취소하고 False, 아니면 좋아요하고 True
+    if Like.objects.filter(article=article.pk, user=user_pk).exists():
+        remove_like(article, user_pk)
+        return False
+    add_like(article, user_pk)
+    return True
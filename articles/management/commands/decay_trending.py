@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from articles import trending
+
+
+class Command(BaseCommand):
+    help = "인기 게시글 점수를 경과 시간만큼 감쇠시킵니다. (cron 등으로 주기 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=float,
+            default=1.0,
+            help="지난 감쇠 이후 경과 시간 (실행 주기와 같게 설정)",
+        )
+
+    def handle(self, *args, hours, **options):
+        decayed, pruned = trending.decay(hours)
+        self.stdout.write(self.style.SUCCESS(f"{decayed}개 점수 감쇠, {pruned}개 삭제 완료."))
@@ -0,0 +1,54 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from articles.export import (
+    OUTPUTS,
+    export_queryset,
+    export_rows,
+    parse_moment,
+    to_csv,
+    to_ndjson,
+)
+
+
+class Command(BaseCommand):
+    help = "게시글 (및 댓글) 을 NDJSON / CSV 로 내보냅니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default="-", help="출력 파일 (기본: 표준 출력)")
+        parser.add_argument("--output", choices=OUTPUTS, default="ndjson")
+        parser.add_argument("--since", help="updated_at 이 이 시각 이후인 게시글만")
+        parser.add_argument("--until", help="updated_at 이 이 시각 이전인 게시글만")
+        parser.add_argument("--topic", help="주제")
+        parser.add_argument("--comments", action="store_true", help="댓글도 함께 내보내기")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="한 번에 DB 에서 읽어올 행 수",
+        )
+
+    def handle(
+        self, *args, path, output, since, until, topic, comments, chunk_size, **options
+    ):
+        try:
+            since = parse_moment(since) if since else None
+            until = parse_moment(until) if until else None
+        except ValueError as exc:
+            raise CommandError(f"잘못된 날짜 형식입니다: {exc}")
+        try:
+            articles = export_queryset(since, until, topic)
+        except ValueError:
+            raise CommandError(f"잘못된 주제입니다: {topic}")
+        rows = export_rows(articles, comments=comments, chunk_size=chunk_size)
+        chunks = to_csv(rows) if output == "csv" else to_ndjson(rows)
+        out = sys.stdout.buffer if path == "-" else open(path, "wb")
+        try:
+            for chunk in chunks:
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+        if path != "-":
+            self.stdout.write(self.style.SUCCESS(f"{path} 에 내보내기 완료."))
@@ -0,0 +1,101 @@
+import json
+import os
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from articles.importer import ForumImporter, source_timestamps
+from articles.models import Article, Comment
+
+
+class Command(BaseCommand):
+    help = (
+        "JSONL 로 된 유저 / 팔로우 / 게시글 / 댓글 / 좋아요를 청크 단위로 가져옵니다. "
+        "한 줄에 레코드 하나이며 type 필드(user, article, comment, follow, like)로 구분합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSONL 파일")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="한 트랜잭션에서 처리할 줄 수",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="이어받기 위치를 기록할 파일 (기본: <path>.checkpoint)",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="체크포인트를 무시하고 처음부터 가져오기",
+        )
+
+    def handle(self, *args, path, chunk_size, checkpoint, restart, **options):
+        if not os.path.exists(path):
+            raise CommandError(f"파일이 없습니다: {path}")
+        checkpoint = checkpoint or f"{path}.checkpoint"
+        state = {"offset": 0, "line": 0}
+        if not restart and os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                state = json.load(f)
+            self.stdout.write(f"{state['line']}번째 줄부터 이어서 가져옵니다.")
+
+        importer = ForumImporter(on_error=self.report_error)
+        started = time.monotonic()
+        lines = 0
+        with open(path, "rb") as f, source_timestamps(
+            get_user_model(), Article, Comment
+        ):
+            f.seek(state["offset"])
+            lineno = state["line"]
+            while True:
+                records = []
+                for raw in iter(f.readline, b""):
+                    lineno += 1
+                    if not raw.strip():
+                        continue
+                    try:
+                        records.append((lineno, json.loads(raw)))
+                    except ValueError as exc:
+                        importer.error(lineno, f"JSON 파싱 실패: {exc}")
+                    if len(records) >= chunk_size:
+                        break
+                if not records:
+                    break
+                importer.import_chunk(records)
+                # 청크가 커밋된 뒤에만 위치를 기록 (다시 실행하면 이미 있는 pk 는 건너뛴다)
+                state = {"offset": f.tell(), "line": lineno}
+                self.save_checkpoint(checkpoint, state)
+                lines += len(records)
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{lineno}번째 줄까지 완료 "
+                    f"({lines / elapsed:.0f} 레코드/초, {sum(importer.created.values()) / elapsed:.0f} 행/초)"
+                )
+        importer.finish()
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+
+        elapsed = time.monotonic() - started
+        created = ", ".join(
+            f"{name} {count}" for name, count in importer.created.items()
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"가져오기 완료: {created or '없음'} "
+                f"(건너뜀 {importer.skipped}, 오류 {importer.errors}, {elapsed:.1f}초). "
+                "검색 인덱스는 rebuild_search_index 로 다시 만드세요."
+            )
+        )
+
+    def report_error(self, lineno, message):
+        self.stderr.write(f"{lineno}번째 줄: {message}")
+
+    def save_checkpoint(self, checkpoint, state):
+        tmp = f"{checkpoint}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, checkpoint)
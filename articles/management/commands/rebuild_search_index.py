@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from articles.models import Article
+from articles.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "게시글 검색 인덱스를 처음부터 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="한 트랜잭션에서 색인할 게시글 수",
+        )
+
+    def handle(self, *args, batch_size, **options):
+        backend = get_search_backend()
+        backend.clear()
+        articles = Article.objects.only("title", "content", "topic").order_by("pk")
+        batch = []
+        indexed = 0
+        # 전체를 메모리에 올리지 않도록 iterator 로 읽어서 배치 단위로 색인
+        for article in articles.iterator(chunk_size=batch_size):
+            batch.append(article)
+            if len(batch) >= batch_size:
+                with transaction.atomic():
+                    backend.index(batch)
+                indexed += len(batch)
+                batch = []
+        if batch:
+            with transaction.atomic():
+                backend.index(batch)
+            indexed += len(batch)
+        self.stdout.write(self.style.SUCCESS(f"{indexed}개 게시글 색인 완료."))
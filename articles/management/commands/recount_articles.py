@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from articles.models import Article
+
+
+class Command(BaseCommand):
+    help = "게시글의 likes_count / comments_count 를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="한 번의 UPDATE 로 처리할 게시글 pk 범위",
+        )
+
+    def handle(self, *args, batch_size, **options):
+        last = Article.objects.aggregate(last=Max("pk"))["last"] or 0
+        updated = 0
+        # pk 범위 단위로 잘라서 긴 쓰기 잠금을 피한다
+        for start in range(0, last, batch_size):
+            updated += Article.objects.filter(
+                pk__gt=start, pk__lte=start + batch_size
+            ).recount()
+        self.stdout.write(self.style.SUCCESS(f"{updated}개 게시글 카운터 갱신 완료."))
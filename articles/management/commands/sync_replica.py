@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "로컬 개발용: primary SQLite 파일을 replica SQLite 파일들로 복사합니다. "
+        "(실제 DB 의 복제는 DB 서버가 담당합니다.)"
+    )
+
+    def handle(self, *args, **options):
+        primary = connections["default"]
+        if primary.vendor != "sqlite":
+            raise CommandError("SQLite 에서만 사용할 수 있습니다.")
+        if not settings.REPLICA_DATABASES:
+            raise CommandError("DATABASE_REPLICAS 가 설정되지 않았습니다.")
+        primary.ensure_connection()
+        for alias in settings.REPLICA_DATABASES:
+            replica = connections[alias]
+            replica.ensure_connection()
+            # sqlite3 온라인 백업 API 로 쓰기 중에도 일관된 사본을 만든다
+            primary.connection.backup(replica.connection)
+            self.stdout.write(self.style.SUCCESS(f"{alias} 동기화 완료."))
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_comment_password_alter_comment_author'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-updated_at', '-id'], name='article_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', '-updated_at', '-id'], name='article_author_updated_idx'),
+        ),
+    ]
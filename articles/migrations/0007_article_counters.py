@@ -0,0 +1,49 @@
+# Generated by Django 4.2.5 on 2026-10-18 20:59
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Article = apps.get_model("articles", "Article")
+    Comment = apps.get_model("articles", "Comment")
+    likes = (
+        Article.likes.through.objects.filter(article=OuterRef("pk"))
+        .order_by()
+        .values("article")
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    comments = (
+        Comment.objects.filter(article=OuterRef("pk"))
+        .order_by()
+        .values("article")
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    Article.objects.update(
+        likes_count=Coalesce(Subquery(likes), 0),
+        comments_count=Coalesce(Subquery(comments), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0006_article_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='comments_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='likes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.5 on 2026-10-18 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0007_article_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["article", "created_at", "id"],
+                name="comment_article_created_idx",
+            ),
+        ),
+    ]
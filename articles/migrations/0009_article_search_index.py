@@ -0,0 +1,65 @@
+# Generated by Django 4.2.5 on 2026-10-18 21:04
+
+import re
+
+from django.db import migrations
+
+# articles.search 의 토크나이저를 이 시점 그대로 복사해 둔다
+# (앱 코드가 바뀌어도 이 마이그레이션의 색인 결과는 바뀌지 않도록)
+HANGUL = "\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3"
+WORD_RE = re.compile(r"\w+")
+HANGUL_RE = re.compile(f"[{HANGUL}]+")
+SPLIT_RE = re.compile(f"[{HANGUL}]+|[^{HANGUL}]+")
+
+
+def tokenize(text):
+    tokens = []
+    for word in WORD_RE.findall((text or "").lower()):
+        for part in SPLIT_RE.findall(word):
+            if HANGUL_RE.match(part) and len(part) > 1:
+                tokens.extend(part[i : i + 2] for i in range(len(part) - 1))
+            else:
+                tokens.append(part)
+    return tokens
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 가상 테이블은 SQLite 에서만 만든다
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE articles_article_fts "
+        "USING fts5(title, content, topic UNINDEXED, tokenize='unicode61')"
+    )
+    Article = apps.get_model("articles", "Article")
+    rows = (
+        (
+            article.pk,
+            " ".join(tokenize(article.title)),
+            " ".join(tokenize(article.content)),
+            article.topic,
+        )
+        for article in Article.objects.only("title", "content", "topic").iterator()
+    )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO articles_article_fts (rowid, title, content, topic) "
+            "VALUES (%s, %s, %s, %s)",
+            rows,
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS articles_article_fts")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0008_comment_article_created_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
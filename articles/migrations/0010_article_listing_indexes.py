@@ -0,0 +1,57 @@
+# Generated by Django 4.2.5 on 2026-10-18 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0009_article_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["topic", "-updated_at", "-id"], name="article_topic_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["-likes_count", "-id"], name="article_likes_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["author", "-likes_count", "-id"],
+                name="article_author_likes_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["topic", "-likes_count", "-id"], name="article_topic_likes_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["-comments_count", "-id"], name="article_comments_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["author", "-comments_count", "-id"],
+                name="article_author_comments_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["topic", "-comments_count", "-id"],
+                name="article_topic_comments_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.5 on 2026-10-18 21:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("articles", "0010_article_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrendingScore",
+            fields=[
+                (
+                    "article",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="trending",
+                        serialize=False,
+                        to="articles.article",
+                    ),
+                ),
+                (
+                    "topic",
+                    models.CharField(
+                        choices=[
+                            ("all", "----"),
+                            ("game", "게임"),
+                            ("movie", "영화"),
+                            ("book", "책"),
+                            ("music", "음악"),
+                            ("picture", "그림"),
+                        ],
+                        max_length=64,
+                    ),
+                ),
+                ("score", models.FloatField(default=0)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["-score", "article"], name="trending_score_idx"
+                    ),
+                    models.Index(
+                        fields=["topic", "-score", "article"],
+                        name="trending_topic_score_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
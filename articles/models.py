@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
 from config.settings import AUTH_USER_MODEL
 
@@ -12,6 +14,29 @@ TOPIC_CHOICES = [
 ]
 
 
+class ArticleQuerySet(models.QuerySet):
+    # 좋아요 / 댓글 수 컬럼을 실제 테이블 기준으로 다시 계산 (UPDATE 한 번)
+    def recount(self):
+        likes = (
+            Article.likes.through.objects.filter(article=OuterRef("pk"))
+            .order_by()
+            .values("article")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        comments = (
+            Comment.objects.filter(article=OuterRef("pk"))
+            .order_by()
+            .values("article")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        return self.update(
+            likes_count=Coalesce(Subquery(likes), 0),
+            comments_count=Coalesce(Subquery(comments), 0),
+        )
+
+
 class Article(models.Model):
     author = models.ForeignKey(
         AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="articles"
@@ -20,9 +45,48 @@ class Article(models.Model):
     content = models.TextField()
     topic = models.CharField(choices=TOPIC_CHOICES, max_length=64)
     likes = models.ManyToManyField(AUTH_USER_MODEL, related_name="likes")
+    likes_count = models.IntegerField(default=0)
+    comments_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ArticleQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # 목록 키셋 페이지네이션 (정렬 필드, pk)
+            models.Index(fields=["-updated_at", "-id"], name="article_updated_idx"),
+            models.Index(
+                fields=["author", "-updated_at", "-id"],
+                name="article_author_updated_idx",
+            ),
+            models.Index(
+                fields=["topic", "-updated_at", "-id"],
+                name="article_topic_updated_idx",
+            ),
+            # 좋아요 / 댓글 수 정렬
+            models.Index(fields=["-likes_count", "-id"], name="article_likes_idx"),
+            models.Index(
+                fields=["author", "-likes_count", "-id"],
+                name="article_author_likes_idx",
+            ),
+            models.Index(
+                fields=["topic", "-likes_count", "-id"],
+                name="article_topic_likes_idx",
+            ),
+            models.Index(
+                fields=["-comments_count", "-id"], name="article_comments_idx"
+            ),
+            models.Index(
+                fields=["author", "-comments_count", "-id"],
+                name="article_author_comments_idx",
+            ),
+            models.Index(
+                fields=["topic", "-comments_count", "-id"],
+                name="article_topic_comments_idx",
+            ),
+        ]
+
     def __str__(self):
         return str(self.title)
 
@@ -37,3 +101,52 @@ class Comment(models.Model):
     content = models.TextField()
     password = models.CharField(max_length=128, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # 게시글별 댓글 키셋 페이지네이션 (created_at, pk)
+            models.Index(
+                fields=["article", "created_at", "id"],
+                name="comment_article_created_idx",
+            ),
+        ]
+
+
+class TrendingScore(models.Model):
+    # 좋아요 / 댓글에 가중치를 더하고 주기적으로 감쇠시키는 인기 점수
+    article = models.OneToOneField(
+        Article, on_delete=models.CASCADE, primary_key=True, related_name="trending"
+    )
+    topic = models.CharField(choices=TOPIC_CHOICES, max_length=64)
+    score = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-score", "article"], name="trending_score_idx"),
+            models.Index(
+                fields=["topic", "-score", "article"], name="trending_topic_score_idx"
+            ),
+        ]
+
+
+class TimelineEntry(models.Model):
+    # 팔로우한 유저의 새 게시글을 글 작성 시점에 팔로워별로 미리 넣어두는 타임라인
+    user = models.ForeignKey(
+        AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="timeline"
+    )
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="+")
+    # 언팔로우 시 해당 유저의 글만 지우기 위해 작성자를 같이 저장
+    author = models.ForeignKey(
+        AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+
+    class Meta:
+        constraints = [
+            # (user, article) 인덱스를 역순으로 읽어 최신 글부터 페이지네이션
+            models.UniqueConstraint(
+                fields=["user", "article"], name="timeline_user_article_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "author"], name="timeline_user_author_idx"),
+        ]
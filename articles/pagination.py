@@ -0,0 +1,195 @@
+import json
+import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor(position, reverse=False):
+    values = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in position
+    ]
+    raw = json.dumps({"p": values, "r": int(reverse)}, separators=(",", ":"))
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+# 커서 위치 값 변환 (잘못된 값이면 TypeError / ValueError)
+def cursor_int(value):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError(value)
+    # SQLite / PostgreSQL bigint 범위를 넘으면 쿼리에서 OverflowError 가 난다
+    if not -(2**63) <= value < 2**63:
+        raise ValueError(value)
+    return value
+
+
+def cursor_float(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(value)
+    if not math.isfinite(value):
+        raise ValueError(value)
+    return float(value)
+
+
+def cursor_datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    # 모델 DateTimeField 와 같은 기준 (USE_TZ) 으로 맞춘다
+    if settings.USE_TZ and timezone.is_naive(parsed):
+        return timezone.make_aware(parsed)
+    if not settings.USE_TZ and timezone.is_aware(parsed):
+        return timezone.make_naive(parsed)
+    return parsed
+
+
+def decode_cursor(encoded, types):
+    # types 는 위치 값마다의 변환 함수 (cursor_int 등), 하나라도 실패하면 404
+    try:
+        padded = encoded + "=" * (-len(encoded) % 4)
+        data = json.loads(urlsafe_b64decode(padded.encode()))
+        position = data["p"]
+        reverse = bool(data.get("r", 0))
+        if not isinstance(position, list) or len(position) != len(types):
+            raise ValueError(position)
+        position = [convert(value) for convert, value in zip(types, position)]
+    except (TypeError, ValueError, KeyError, AttributeError, ValidationError):
+        raise NotFound("잘못된 커서입니다.")
+    return position, reverse
+
+
+# 정렬 필드 타입별 커서 위치 값 변환
+CURSOR_TYPES = {
+    "AutoField": cursor_int,
+    "BigAutoField": cursor_int,
+    "IntegerField": cursor_int,
+    "BigIntegerField": cursor_int,
+    "PositiveIntegerField": cursor_int,
+    "FloatField": cursor_float,
+    "DateTimeField": cursor_datetime,
+}
+
+
+class KeysetPagination(BasePagination):
+    # (정렬 필드..., pk) 기준 키셋 페이지네이션
+    # OFFSET 없이 인덱스 범위 탐색만 하므로 커서 깊이와 상관없이 페이지 비용이 같다
+    ordering = ("-updated_at", "-pk")
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def _fields(self):
+        return [field.lstrip("-") for field in self.ordering]
+
+    def _types(self, model):
+        types = []
+        for name in self._fields():
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+            types.append(CURSOR_TYPES.get(field.get_internal_type(), field.to_python))
+        return types
+
+    def _after(self, position, reverse):
+        # 정렬 순서상 position 다음(reverse 면 이전)에 오는 행의 조건
+        descending = self.ordering[0].startswith("-")
+        if reverse:
+            descending = not descending
+        op = "lt" if descending else "gt"
+        fields = self._fields()
+        condition = Q()
+        for i in reversed(range(len(fields))):
+            strict = Q(**{f"{fields[i]}__{op}": position[i]})
+            if i == len(fields) - 1:
+                condition = strict
+            else:
+                condition = strict | (Q(**{fields[i]: position[i]}) & condition)
+        # 첫 필드의 닫힌 범위를 같이 걸어 인덱스 범위 탐색이 되도록 한다
+        bound = Q(**{f"{fields[0]}__{op}e": position[0]})
+        return bound & condition
+
+    def _position(self, row):
+        if isinstance(row, dict):
+            return [row[field] for field in self._fields()]
+        return [getattr(row, field) for field in self._fields()]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        size = self.get_page_size(request)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            position, reverse = decode_cursor(encoded, self._types(queryset.model))
+            queryset = queryset.filter(self._after(position, reverse))
+        else:
+            position, reverse = None, False
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                field[1:] if field.startswith("-") else "-" + field
+                for field in ordering
+            )
+        rows = list(queryset.order_by(*ordering)[: size + 1])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = rows
+        return rows
+
+    def _link(self, position, reverse):
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encode_cursor(position, reverse)
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self._position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self._position(self.page[0]), True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
@@ -0,0 +1,136 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+HANGUL = "\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3"
+WORD_RE = re.compile(r"\w+")
+HANGUL_RE = re.compile(f"[{HANGUL}]+")
+SPLIT_RE = re.compile(f"[{HANGUL}]+|[^{HANGUL}]+")
+
+
+def _split(word):
+    # 한글은 조사 / 어미가 붙어 띄어쓰기 단위로는 검색이 안 되므로 2-gram 으로 자른다
+    tokens = []
+    for part in SPLIT_RE.findall(word):
+        if HANGUL_RE.match(part) and len(part) > 1:
+            tokens.extend(part[i : i + 2] for i in range(len(part) - 1))
+        else:
+            tokens.append(part)
+    return tokens
+
+
+def tokenize(text):
+    tokens = []
+    for word in WORD_RE.findall((text or "").lower()):
+        tokens.extend(_split(word))
+    return tokens
+
+
+def build_query(text):
+    # 검색어의 각 단어는 토큰이 연속으로 나와야 하는 phrase 로, 단어끼리는 AND 로 묶는다
+    # 한 글자 한글 단어는 그 글자로 시작하는 2-gram 을 찾도록 prefix 검색을 쓴다
+    phrases = []
+    for word in WORD_RE.findall((text or "").lower()):
+        tokens = _split(word)
+        phrase = '"' + " ".join(tokens) + '"'
+        if len(tokens) == 1 and len(tokens[0]) == 1:
+            phrase += "*"
+        phrases.append(phrase)
+    return " ".join(phrases)
+
+
+class BaseSearchBackend:
+    # 검색 인덱스 백엔드 인터페이스
+    # search() 는 (article pk, score) 를 score 오름차순, pk 오름차순으로 돌려준다
+    def index(self, articles):
+        raise NotImplementedError
+
+    def remove(self, pks):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def search(self, query, topic=None, after=None, limit=20):
+        raise NotImplementedError
+
+
+class NullSearchBackend(BaseSearchBackend):
+    # 전문 검색 인덱스가 없는 DB 용 (색인하지 않고 검색 결과도 없다)
+    def index(self, articles):
+        pass
+
+    def remove(self, pks):
+        pass
+
+    def clear(self):
+        pass
+
+    def search(self, query, topic=None, after=None, limit=20):
+        return []
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    table = "articles_article_fts"
+
+    def index(self, articles):
+        rows = [
+            (
+                article.pk,
+                " ".join(tokenize(article.title)),
+                " ".join(tokenize(article.content)),
+                article.topic,
+            )
+            for article in articles
+        ]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [(row[0],) for row in rows],
+            )
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, content, topic) "
+                "VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, pks):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s", [(pk,) for pk in pks]
+            )
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def search(self, query, topic=None, after=None, limit=20):
+        match = build_query(query)
+        if not match:
+            return []
+        # 제목 일치에 본문보다 2배 가중치
+        sql = (
+            f"SELECT rowid, bm25({self.table}, 2.0, 1.0) AS score FROM {self.table} "
+            f"WHERE {self.table} MATCH %s"
+        )
+        params = [match]
+        if topic:
+            sql += " AND topic = %s"
+            params.append(topic)
+        sql = f"SELECT rowid, score FROM ({sql})"
+        if after:
+            sql += " WHERE score > %s OR (score = %s AND rowid > %s)"
+            params += [after[0], after[0], after[1]]
+        sql += " ORDER BY score, rowid LIMIT %s"
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+def get_search_backend():
+    return import_string(settings.ARTICLE_SEARCH_BACKEND)()
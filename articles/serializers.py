@@ -1,11 +1,11 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
 from .models import Article, TOPIC_CHOICES, Comment
 
 
 class ArticleListSerializer(serializers.ModelSerializer):
     author = serializers.SerializerMethodField()
-    likes_count = serializers.IntegerField()
-    comments_count = serializers.IntegerField()
 
     def get_author(self, obj):
         author = obj.author
@@ -47,10 +47,85 @@ class CommentListSerializer(serializers.ModelSerializer):
         )
 
 
+def _author(pk, nickname):
+    if pk is None:
+        return None
+    return {"pk": pk, "nickname": nickname}
+
+
+class RowSerializer:
+    # 목록 조회 전용 직렬화
+    # ModelSerializer 의 필드 객체 / SerializerMethodField 를 거치지 않고
+    # .values() 행(dict)에서 바로 같은 JSON 이 나오는 dict 를 만든다
+    columns = ()
+
+    def __init__(self, rows, many=True):
+        self.rows = rows
+
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values(*cls.columns)
+
+    @classmethod
+    def in_bulk(cls, queryset, pks):
+        return {row["pk"]: row for row in cls.values(queryset.filter(pk__in=pks))}
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.rows]
+
+
+class ArticleListRowSerializer(RowSerializer):
+    # ArticleListSerializer 와 같은 출력
+    columns = (
+        "pk",
+        "title",
+        "topic",
+        "author_id",
+        "author__nickname",
+        "likes_count",
+        "comments_count",
+        "updated_at",
+    )
+    updated_at = serializers.DateTimeField()
+
+    def to_representation(self, row):
+        return {
+            "pk": row["pk"],
+            "title": row["title"],
+            "topic": row["topic"],
+            "author": _author(row["author_id"], row["author__nickname"]),
+            "likes_count": row["likes_count"],
+            "comments_count": row["comments_count"],
+            "updated_at": self.updated_at.to_representation(row["updated_at"]),
+        }
+
+
+class CommentListRowSerializer(RowSerializer):
+    # CommentListSerializer 와 같은 출력
+    columns = ("pk", "content", "author_id", "author__nickname", "created_at")
+    created_at = serializers.DateTimeField()
+
+    def to_representation(self, row):
+        return {
+            "pk": row["pk"],
+            "content": row["content"],
+            "author": _author(row["author_id"], row["author__nickname"]),
+            "created_at": self.created_at.to_representation(row["created_at"]),
+        }
+
+
+def likers_preview(article_pk):
+    likers = get_user_model().objects.filter(likes=article_pk).only("nickname")
+    return likers.order_by("pk")[: settings.ARTICLE_DETAIL_LIKERS]
+
+
 class ArticleDetailSerializer(serializers.ModelSerializer):
     author = serializers.SerializerMethodField()
-    comments = CommentListSerializer(many=True)
-    comments_count = serializers.SerializerMethodField()
+    comments = CommentListSerializer(source="comments_preview", many=True)
     likes = serializers.SerializerMethodField()
 
     def get_author(self, obj):
@@ -60,11 +135,13 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
         else:
             return None
 
+    # 좋아요 유저는 미리보기로 앞의 일부만 포함
+    # (async 뷰처럼 미리 읽어 likers_preview 로 붙여두면 그대로 쓴다)
     def get_likes(self, obj):
-        return [{"pk": user.pk, "nickname": user.nickname} for user in obj.likes.all()]
-
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+        likers = getattr(obj, "likers_preview", None)
+        if likers is None:
+            likers = likers_preview(obj.pk)
+        return [{"pk": user.pk, "nickname": user.nickname} for user in likers]
 
     class Meta:
         model = Article
@@ -87,3 +164,17 @@ class CommentCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ("content",)
+
+
+class LikeBulkSerializer(serializers.Serializer):
+    like = serializers.ListField(
+        child=serializers.IntegerField(), max_length=500, required=False, default=list
+    )
+    unlike = serializers.ListField(
+        child=serializers.IntegerField(), max_length=500, required=False, default=list
+    )
+
+    def validate(self, attrs):
+        if set(attrs["like"]) & set(attrs["unlike"]):
+            raise serializers.ValidationError("같은 게시글을 동시에 좋아요 / 취소할 수 없습니다.")
+        return attrs
@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import invalidate_article
+from .models import Article, Comment
+from .search import get_search_backend
+
+
+# 유저 삭제 시 CASCADE 로 지워지는 좋아요 / 댓글은 뷰를 거치지 않으므로
+# 영향받는 게시글의 카운터를 삭제 후에 다시 계산하고 상세 캐시를 무효화한다
+@receiver(pre_delete, sender=get_user_model())
+def collect_counted_articles(sender, instance, **kwargs):
+    liked = Article.likes.through.objects.filter(user=instance).values_list(
+        "article", flat=True
+    )
+    commented = Comment.objects.filter(author=instance).values_list(
+        "article", flat=True
+    )
+    authored = Article.objects.filter(author=instance).values_list("pk", flat=True)
+    instance._counted_article_pks = set(liked) | set(commented)
+    instance._authored_article_pks = set(authored)
+
+
+@receiver(post_delete, sender=get_user_model())
+def recount_counted_articles(sender, instance, **kwargs):
+    pks = getattr(instance, "_counted_article_pks", set())
+    if pks:
+        Article.objects.filter(pk__in=pks).recount()
+    for pk in pks | getattr(instance, "_authored_article_pks", set()):
+        invalidate_article(pk)
+
+
+# 게시글 검색 인덱스 동기화
+@receiver(post_save, sender=Article)
+def index_article(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Article)
+def unindex_article(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
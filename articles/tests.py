@@ -1,3 +1,1553 @@
-from django.test import TestCase
+from datetime import datetime
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from io import BytesIO, StringIO
+import csv
+import json
+import os
+import tempfile
+import time
+from urllib.parse import urlencode
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import F
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from accounts.follow_graph import add_follow
+from config.parsers import FastJSONParser
+from config.testing import QueryBudgetMixin
+from config.renderers import FastJSONRenderer
+from config.routers import ReplicaRouter, replica_reads
+from config.throttling import SlidingWindowRateThrottle
+from .cache import invalidate_article
+from .hashers import check_comment_password, make_comment_password
+from .management.commands.import_forum import Command as ImportCommand
+from .likes import add_like, remove_like
+from .models import Article, Comment, TimelineEntry, TrendingScore
+from .pagination import encode_cursor
+from .search import build_query, tokenize
+from .throttling import CommentPasswordRateThrottle
+from .views import LikeBulkAPI
+from . import timeline, trending, write_behind
+from .serializers import (
+    ArticleListRowSerializer,
+    ArticleListSerializer,
+    CommentListRowSerializer,
+    CommentListSerializer,
+)
+
+
+def create_user(name):
+    return get_user_model().objects.create_user(
+        username=name,
+        email=f"{name}@example.com",
+        password="password",
+        fullname=name,
+        nickname=name,
+    )
+
+
+class ArticleListQueryPlanTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        Article.objects.bulk_create(
+            Article(
+                author=cls.author,
+                title=f"title {i}",
+                content="content",
+                topic=("game", "movie", "book")[i % 3],
+                likes_count=i % 7,
+                comments_count=i % 5,
+            )
+            for i in range(60)
+        )
+
+    def explain_list(self, url):
+        # 목록 API 가 실제로 실행한 게시글 조회 쿼리의 실행 계획
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        # ETag 용 최근 updated_at 조회 다음의 페이지 조회
+        sql = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "articles_article"')
+        ][-1]
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            plan = " / ".join(row[-1] for row in cursor.fetchall())
+        return response, plan
+
+    def assert_index_scan(self, url, index):
+        response, plan = self.explain_list(url)
+        self.assertIn(f"USING INDEX {index}", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+        return response
+
+    def test_orderings_use_index(self):
+        cases = [
+            ("/articles/", "article_updated_idx"),
+            ("/articles/?ordering=likes", "article_likes_idx"),
+            ("/articles/?ordering=comments", "article_comments_idx"),
+            ("/articles/?topic=game", "article_topic_updated_idx"),
+            ("/articles/?topic=game&ordering=likes", "article_topic_likes_idx"),
+            ("/articles/?topic=game&ordering=comments", "article_topic_comments_idx"),
+            (f"/articles/{self.author.pk}/", "article_author_updated_idx"),
+            (
+                f"/articles/?author={self.author.pk}&ordering=likes",
+                "article_author_likes_idx",
+            ),
+            (
+                f"/accounts/{self.author.pk}/articles/?ordering=comments",
+                "article_author_comments_idx",
+            ),
+        ]
+        for url, index in cases:
+            with self.subTest(url=url):
+                self.assert_index_scan(url, index)
+
+    def test_next_page_uses_index(self):
+        response = self.client.get("/articles/?topic=movie&ordering=likes&page_size=5")
+        self.assert_index_scan(response.data["next"], "article_topic_likes_idx")
+
+    def test_filter_and_ordering(self):
+        response = self.client.get("/articles/?topic=book&ordering=likes&page_size=100")
+        results = response.data["results"]
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(article["topic"] == "book" for article in results))
+        keys = [(article["likes_count"], article["pk"]) for article in results]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get("/articles/?ordering=views").status_code, 400)
+        self.assertEqual(self.client.get("/articles/?topic=sports").status_code, 400)
+
+    def test_cursor_round_trip(self):
+        first = self.client.get("/articles/?page_size=25").data
+        second = self.client.get(first["next"]).data
+        self.assertEqual(len(second["results"]), 25)
+        self.assertLess(second["results"][0]["pk"], first["results"][-1]["pk"])
+        previous = self.client.get(second["previous"]).data
+        self.assertEqual(previous["results"], first["results"])
+
+    def test_bad_cursor(self):
+        # 조작한 커서는 500 이 아니라 404
+        self.client.force_authenticate(self.author)
+        urls = [
+            "/articles/?cursor={}",
+            "/articles/?ordering=likes&cursor={}",
+            "/accounts/timeline/?cursor={}",
+            f"/accounts/{self.author.pk}/follow/?followers_cursor={{}}",
+            f"/articles/{self.author.pk}/{Article.objects.first().pk}/comments/?cursor={{}}",
+        ]
+        positions = [
+            ["abc", "x"],
+            [{"a": 1}, 1],
+            ["2020-01-01", "zz"],
+            [[1], 1],
+            [1, 2**64],
+            [True],
+            "abc",
+            None,
+        ]
+        for url in urls:
+            for position in positions:
+                cursor = encode_cursor(position) if position is not None else "%%%"
+                with self.subTest(url=url, position=position):
+                    response = self.client.get(url.format(cursor))
+                    self.assertEqual(response.status_code, 404)
+                    self.assertEqual(response.data["detail"], "잘못된 커서입니다.")
+
+
+class SearchQueryTest(SimpleTestCase):
+    def test_tokenize(self):
+        # 한글은 2-gram, 나머지는 단어 그대로 (소문자)
+        self.assertEqual(
+            tokenize("한국어 검색 Django와 파이썬3"),
+            ["한국", "국어", "검색", "django", "와", "파이", "이썬", "3"],
+        )
+        self.assertEqual(tokenize("한"), ["한"])
+        self.assertEqual(tokenize(None), [])
+
+    def test_build_query(self):
+        # 단어마다 phrase, 단어끼리 AND, 한 글자는 prefix
+        self.assertEqual(build_query("파이썬 장고"), '"파이 이썬" "장고"')
+        self.assertEqual(build_query("한"), '"한"*')
+        self.assertEqual(build_query("Django와"), '"django 와"')
+        self.assertEqual(build_query("  !! "), "")
+
+
+class SearchTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        texts = [
+            ("파이썬 입문", "파이썬으로 배우는 프로그래밍", "book"),
+            ("장고 튜토리얼", "파이썬 웹 프레임워크 장고", "book"),
+            ("게임 후기", "파이썬으로 만든 게임", "game"),
+            ("영화 리뷰", "한국 영화 이야기", "movie"),
+            ("이썬 파이", "순서가 뒤바뀐 글자", "movie"),
+        ]
+        cls.articles = {
+            title: Article.objects.create(
+                author=cls.author, title=title, content=content, topic=topic
+            )
+            for title, content, topic in texts
+        }
+
+    def search(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def titles(self, url):
+        return {article["title"] for article in self.search(url)["results"]}
+
+    def test_korean(self):
+        # 조사가 붙은 단어도 찾고, 2-gram 순서가 다른 글은 찾지 않는다
+        self.assertEqual(
+            self.titles("/articles/search/?q=파이썬"),
+            {"파이썬 입문", "장고 튜토리얼", "게임 후기"},
+        )
+        self.assertEqual(self.titles("/articles/search/?q=한"), {"영화 리뷰"})
+        self.assertEqual(self.titles("/articles/search/?q=파이썬 장고"), {"장고 튜토리얼"})
+        self.assertEqual(self.titles("/articles/search/?q=파이썬&topic=game"), {"게임 후기"})
+        self.assertEqual(self.titles("/articles/search/?q=없는단어"), set())
+
+    def test_cursor_paging(self):
+        # 실제 클라이언트처럼 검색어를 퍼센트 인코딩해서 보낸다
+        url = "/articles/search/?" + urlencode({"q": "파이썬", "page_size": 1})
+        seen = []
+        while url:
+            data = self.search(url)
+            seen += [article["title"] for article in data["results"]]
+            url = data["next"]
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(set(seen), {"파이썬 입문", "장고 튜토리얼", "게임 후기"})
+
+    def test_bad_cursor(self):
+        for position in [[[1], 1], ["a", 1], [1.5, "x"]]:
+            with self.subTest(position=position):
+                response = self.client.get(
+                    f"/articles/search/?q=파이썬&cursor={encode_cursor(position)}"
+                )
+                self.assertEqual(response.status_code, 404)
+
+    def test_index_follows_edits(self):
+        article = self.articles["영화 리뷰"]
+        article.content = "파이썬 영화"
+        article.save()
+        self.assertIn("영화 리뷰", self.titles("/articles/search/?q=파이썬"))
+        article.delete()
+        self.assertNotIn("영화 리뷰", self.titles("/articles/search/?q=파이썬"))
+
+    @override_settings(ARTICLE_SEARCH_BACKEND="articles.search.NullSearchBackend")
+    def test_null_backend(self):
+        Article.objects.create(
+            author=self.author, title="파이썬", content="본문", topic="game"
+        )
+        self.assertEqual(self.titles("/articles/search/?q=파이썬"), set())
+
+
+class FastJSONTest(SimpleTestCase):
+    payloads = [
+        {"title": "한글 제목", "content": "줄\n바꿈\t탭 \u2028 \u2029 \x00 😀"},
+        [{"pk": 1, "author": {"pk": 2, "nickname": "닉네임"}, "likes_count": 0}],
+        {"score": [0.1, 1.5, 1e-05, 1e-07, 1e16, 1.2345678901234568e17, -0.0]},
+        {"big": 2**70, "decimal": Decimal("1.50"), "none": None, "bool": True},
+        {
+            "at": datetime(2023, 9, 1, 12, 30, 15, 123456),
+            "date": datetime(2023, 9, 1).date(),
+        },
+        {1: "문자열이 아닌 키"},
+    ]
+
+    def test_render_is_byte_identical(self):
+        for data in self.payloads:
+            with self.subTest(data=data):
+                self.assertEqual(
+                    FastJSONRenderer().render(data), JSONRenderer().render(data)
+                )
+
+    def test_render_nonfinite_floats(self):
+        # STRICT_JSON (기본) 이면 기본 렌더러처럼 예외, 아니면 NaN / Infinity 로 쓴다
+        for value in [float("nan"), float("inf"), -float("inf")]:
+            data = {"score": [1.0, value], "none": None}
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError) as fast:
+                    FastJSONRenderer().render(data)
+                with self.assertRaises(ValueError) as stdlib:
+                    JSONRenderer().render(data)
+                self.assertEqual(str(fast.exception), str(stdlib.exception))
+                with mock.patch.object(JSONRenderer, "strict", False):
+                    self.assertEqual(
+                        FastJSONRenderer().render(data), JSONRenderer().render(data)
+                    )
+
+    def test_render_with_indent(self):
+        data = self.payloads[0]
+        self.assertEqual(
+            FastJSONRenderer().render(data, "application/json; indent=4"),
+            JSONRenderer().render(data, "application/json; indent=4"),
+        )
+
+    def test_parse_matches_stdlib(self):
+        bodies = [
+            '{"title": "한글", "n": [1, 2.5, -0.0, 1e400], "x": null}'.encode(),
+            b'{"big": 123456789012345678901234567890}',
+            b'{"surrogate": "\\ud800"}',
+        ]
+        for body in bodies:
+            with self.subTest(body=body):
+                self.assertEqual(
+                    FastJSONParser().parse(BytesIO(body)),
+                    JSONParser().parse(BytesIO(body)),
+                )
+
+    def test_parse_errors_match_stdlib(self):
+        for body in [b"{bad", b'{"n": NaN}', b""]:
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as fast:
+                    FastJSONParser().parse(BytesIO(body))
+                with self.assertRaises(ParseError) as stdlib:
+                    JSONParser().parse(BytesIO(body))
+                self.assertEqual(str(fast.exception), str(stdlib.exception))
+
+
+class RowSerializerEquivalenceTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("작성자")
+        cls.reader = create_user("reader")
+        cls.articles = Article.objects.bulk_create(
+            Article(
+                author=(cls.author, cls.reader)[i % 2],
+                title=f"제목 \u2028 {i}",
+                content="본문",
+                topic=("game", "movie", "book")[i % 3],
+                likes_count=i,
+                comments_count=i % 4,
+            )
+            for i in range(10)
+        )
+        # 마이크로초가 0 인 시각은 isoformat 결과 길이가 다르다
+        Article.objects.filter(pk=cls.articles[0].pk).update(
+            updated_at=datetime(2023, 9, 1, 12, 0, 0)
+        )
+        Comment.objects.bulk_create(
+            Comment(
+                article=cls.articles[i % 3],
+                author=(cls.author, None)[i % 2],
+                content=f"댓글 {i}",
+                password=None if i % 2 == 0 else "hash",
+            )
+            for i in range(10)
+        )
+
+    def assertSameJSON(self, fast, slow):
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(slow))
+
+    def test_article_list(self):
+        articles = Article.objects.order_by("-updated_at", "-pk")
+        self.assertSameJSON(
+            ArticleListRowSerializer(
+                ArticleListRowSerializer.values(articles), many=True
+            ).data,
+            ArticleListSerializer(articles, many=True).data,
+        )
+
+    def test_article_in_bulk(self):
+        pks = [article.pk for article in self.articles[::2]]
+        rows = ArticleListRowSerializer.in_bulk(Article.objects.all(), pks)
+        articles = Article.objects.in_bulk(pks)
+        self.assertSameJSON(
+            ArticleListRowSerializer([rows[pk] for pk in pks], many=True).data,
+            ArticleListSerializer([articles[pk] for pk in pks], many=True).data,
+        )
+
+    def test_comment_list(self):
+        comments = Comment.objects.order_by("created_at", "pk")
+        self.assertSameJSON(
+            CommentListRowSerializer(
+                CommentListRowSerializer.values(comments), many=True
+            ).data,
+            CommentListSerializer(comments, many=True).data,
+        )
+
+    def test_list_endpoints(self):
+        response = self.client.get("/articles/?ordering=likes")
+        articles = Article.objects.order_by("-likes_count", "-pk")
+        self.assertSameJSON(
+            response.data["results"], ArticleListSerializer(articles, many=True).data
+        )
+        article = self.articles[0]
+        response = self.client.get(
+            f"/articles/{article.author_id}/{article.pk}/comments/"
+        )
+        self.assertSameJSON(
+            response.data["results"],
+            CommentListSerializer(
+                article.comments.order_by("created_at", "pk"), many=True
+            ).data,
+        )
+
+
+class QueryBudgetTest(QueryBudgetMixin, APITestCase):
+    # 행 수에 비례해 쿼리가 늘면 (N+1) 뷰의 query_budget 을 넘어 실패한다
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        cls.reader = create_user("reader")
+        cls.articles = Article.objects.bulk_create(
+            Article(author=cls.author, title=f"제목 {i}", content="본문", topic="game")
+            for i in range(5)
+        )
+        cls.article = cls.articles[0]
+        cls.article.likes.add(cls.reader)
+        Comment.objects.bulk_create(
+            Comment(article=cls.article, author=(cls.reader, None)[i % 2], content="댓글")
+            for i in range(5)
+        )
+
+    def login(self, user):
+        response = self.client.post(
+            "/accounts/api/token/", {"username": user.username, "password": "password"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def test_read_endpoints(self):
+        base = f"/articles/{self.author.pk}/{self.article.pk}/"
+        for url in [
+            "/articles/",
+            "/articles/search/?q=제목",
+            "/articles/trending/",
+            base,
+            base + "comments/",
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_write_endpoints(self):
+        self.login(self.reader)
+        base = f"/articles/{self.author.pk}/{self.article.pk}/"
+        comment = self.client.post(base, {"content": "새 댓글"}, format="json")
+        self.assertEqual(comment.status_code, 200)
+        self.assertEqual(self.client.post(base + "likes/").status_code, 200)
+        response = self.client.post(
+            "/articles/likes/",
+            {"like": [article.pk for article in self.articles[1:]]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get("/accounts/timeline/").status_code, 200)
+
+    def cold(self, method, url, data=None):
+        # 인증 / 인기 점수 / 유명인 캐시가 모두 비어 있는 첫 요청
+        cache.clear()
+        return getattr(self.client, method)(url, data, format="json")
+
+    def test_cold_write_endpoints(self):
+        # 실제 토큰 로그인으로 인증 쿼리까지 세고, 행이 처음 생기는 경로를 지난다
+        self.login(self.reader)
+        self.reader.followers.add(self.author)
+        first, second, third, fourth = (
+            f"/articles/{self.author.pk}/{article.pk}/" for article in self.articles[1:]
+        )
+        self.assertEqual(self.cold("post", first, {"content": "첫 댓글"}).status_code, 200)
+        comment = Comment.objects.get(author=self.reader, content="첫 댓글")
+        self.assertEqual(
+            self.cold("put", f"{first}{comment.pk}/", {"content": "수정"}).status_code,
+            200,
+        )
+        self.assertEqual(self.cold("delete", f"{first}{comment.pk}/").status_code, 204)
+        self.assertEqual(self.cold("post", second + "likes/").data["message"], "likes!")
+        self.assertEqual(
+            self.cold("post", second + "likes/").data["message"], "unlikes!"
+        )
+        self.assertEqual(self.cold("put", third + "likes/").data["affected"], 1)
+        self.assertEqual(self.cold("delete", third + "likes/").data["affected"], 1)
+        response = self.cold(
+            "post",
+            "/articles/likes/",
+            {
+                "like": [self.articles[3].pk, self.articles[4].pk],
+                "unlike": [self.article.pk],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.cold(
+            "post", "/articles/", {"title": "제목", "content": "본문", "topic": "game"}
+        )
+        self.assertEqual(response.status_code, 201)
+        article = Article.objects.get(author=self.reader)
+        url = f"/articles/{self.reader.pk}/{article.pk}/"
+        data = {"title": "새 제목", "content": "본문", "topic": "movie"}
+        self.assertEqual(self.cold("put", url, data).status_code, 200)
+        self.assertEqual(self.cold("delete", url).status_code, 204)
+
+    def test_over_budget_fails(self):
+        self.login(self.reader)
+        with mock.patch.object(LikeBulkAPI, "query_budget", {"POST": 1}):
+            with self.assertLogs("config.instrumentation", "WARNING"):
+                with self.assertRaisesMessage(AssertionError, "예산 1개"):
+                    self.client.post(
+                        "/articles/likes/", {"like": [self.article.pk]}, format="json"
+                    )
+
+    @override_settings(SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        response = self.client.get("/articles/")
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+        self.assertLessEqual(response.timings["queries"], 2)
+
+
+class ExportTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = create_user("staff")
+        get_user_model().objects.filter(pk=cls.staff.pk).update(is_staff=True)
+        cls.reader = create_user("reader")
+        cls.articles = [
+            Article.objects.create(
+                author=cls.reader, title=f"제목 {i}", content="본문", topic=topic
+            )
+            for i, topic in enumerate(["game", "movie", "game"])
+        ]
+        for article, day in zip(cls.articles, [1, 15, 30]):
+            moment = datetime(2023, 9, day, 10, 0, 0, 123456)
+            Article.objects.filter(pk=article.pk).update(
+                created_at=moment, updated_at=moment
+            )
+        comment = Comment.objects.create(
+            article=cls.articles[0], author=cls.reader, content="댓글"
+        )
+        Comment.objects.filter(pk=comment.pk).update(
+            created_at=datetime(2023, 9, 2, 8, 30)
+        )
+
+    def login(self, username):
+        response = self.client.post(
+            "/accounts/api/token/", {"username": username, "password": "password"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def export(self, query=""):
+        response = self.client.get(f"/articles/export/{query}")
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def ndjson(self, query=""):
+        return [json.loads(line) for line in self.export(query).splitlines()]
+
+    def csv(self, query=""):
+        return list(csv.DictReader(StringIO(self.export(query))))
+
+    def test_staff_only(self):
+        self.assertEqual(self.client.get("/articles/export/").status_code, 401)
+        self.login("reader")
+        self.assertEqual(self.client.get("/articles/export/").status_code, 403)
+
+    def test_formats_agree(self):
+        self.login("staff")
+        ndjson = self.ndjson("?comments=1")
+        rows = self.csv("?output=csv&comments=1")
+        self.assertEqual(
+            [(row["type"], row["pk"]) for row in ndjson],
+            [
+                ("article", self.articles[0].pk),
+                ("comment", Comment.objects.get().pk),
+                ("article", self.articles[1].pk),
+                ("article", self.articles[2].pk),
+            ],
+        )
+        for line, row in zip(ndjson, rows):
+            with self.subTest(type=line["type"], pk=line["pk"]):
+                self.assertEqual(str(line["pk"]), row["pk"])
+                self.assertEqual(line["created_at"], row["created_at"])
+                self.assertEqual(line.get("updated_at", ""), row["updated_at"])
+        self.assertEqual(ndjson[0]["updated_at"], "2023-09-01T10:00:00.123456+09:00")
+        self.assertEqual(ndjson[1]["created_at"], "2023-09-02T08:30:00+09:00")
+
+    def test_since_until(self):
+        self.login("staff")
+        rows = self.ndjson("?since=2023-09-10&until=2023-09-30")
+        self.assertEqual([row["pk"] for row in rows], [self.articles[1].pk])
+        rows = self.csv("?output=csv&since=2023-09-15T10:00:00.123456&topic=game")
+        self.assertEqual([row["pk"] for row in rows], [str(self.articles[2].pk)])
+
+    def test_bad_params(self):
+        self.login("staff")
+        for query in ["?since=2023-13-01", "?until=어제", "?topic=sports", "?output=xml"]:
+            with self.subTest(query=query):
+                response = self.client.get(f"/articles/export/{query}")
+                self.assertEqual(response.status_code, 400)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "articles.csv")
+            stdout = StringIO()
+            call_command(
+                "export_articles",
+                path,
+                output="csv",
+                since="2023-09-10",
+                comments=True,
+                stdout=stdout,
+            )
+            self.assertIn("에 내보내기 완료.", stdout.getvalue())
+            with open(path, newline="") as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual(
+            [row["pk"] for row in rows],
+            [str(self.articles[1].pk), str(self.articles[2].pk)],
+        )
+        self.assertEqual(rows[0]["updated_at"], "2023-09-15T10:00:00.123456+09:00")
+        with self.assertRaisesMessage(CommandError, "잘못된 날짜 형식입니다"):
+            call_command("export_articles", os.devnull, until="2023-02-30")
+
+
+class CounterTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        cls.reader = create_user("reader")
+        cls.other = create_user("other")
+        cls.articles = [
+            Article.objects.create(
+                author=cls.author, title=f"제목 {i}", content="본문", topic="game"
+            )
+            for i in range(3)
+        ]
+        cls.articles[0].likes.add(cls.reader, cls.other)
+        cls.articles[1].likes.add(cls.reader)
+        Comment.objects.bulk_create(
+            Comment(article=cls.articles[0], author=author, content="댓글")
+            for author in [cls.reader, cls.reader, cls.other]
+        )
+        Article.objects.recount()
+
+    def counters(self):
+        return list(
+            Article.objects.order_by("pk").values_list(
+                "pk", "likes_count", "comments_count"
+            )
+        )
+
+    def recounted(self):
+        stored = self.counters()
+        Article.objects.recount()
+        return stored, self.counters()
+
+    def test_user_delete_recounts(self):
+        cache.clear()
+        url = f"/articles/{self.author.pk}/{self.articles[0].pk}/"
+        self.assertEqual(self.client.get(url).data["likes_count"], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reader.delete()
+        stored, expected = self.recounted()
+        self.assertEqual(stored, expected)
+        self.assertEqual(
+            expected,
+            [
+                (self.articles[0].pk, 1, 1),
+                (self.articles[1].pk, 0, 0),
+                (self.articles[2].pk, 0, 0),
+            ],
+        )
+        # 캐시된 상세 응답도 무효화된다
+        response = self.client.get(url)
+        self.assertEqual(
+            (response.data["likes_count"], response.data["comments_count"]), (1, 1)
+        )
+
+    def test_recount_command(self):
+        expected = self.counters()
+        Article.objects.update(likes_count=99, comments_count=-1)
+        stdout = StringIO()
+        call_command("recount_articles", batch_size=2, stdout=stdout)
+        self.assertIn("3개 게시글 카운터 갱신 완료.", stdout.getvalue())
+        self.assertEqual(self.counters(), expected)
+
+
+class TrendingTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        cls.reader = create_user("reader")
+        cls.articles = [
+            Article.objects.create(
+                author=cls.author, title=f"제목 {i}", content="본문", topic=topic
+            )
+            for i, topic in enumerate(["game", "movie", "game"])
+        ]
+        TrendingScore.objects.bulk_create(
+            TrendingScore(article=article, topic=article.topic, score=score)
+            for article, score in zip(cls.articles, [2.0, 4.0, 0.015])
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_rows_match_listing(self):
+        listing = {
+            row["pk"]: row for row in self.client.get("/articles/").data["results"]
+        }
+        results = self.client.get("/articles/trending/").data["results"]
+        self.assertEqual(
+            [row["pk"] for row in results],
+            [self.articles[1].pk, self.articles[0].pk, self.articles[2].pk],
+        )
+        self.assertEqual(results, [listing[row["pk"]] for row in results])
+        results = self.client.get("/articles/trending/?topic=game").data["results"]
+        self.assertEqual(
+            [row["pk"] for row in results], [self.articles[0].pk, self.articles[2].pk]
+        )
+
+    @override_settings(WRITE_BEHIND=True)
+    @mock.patch.object(write_behind.likes, "interval", None)
+    def test_merges_pending_likes(self):
+        self.addCleanup(write_behind.likes.flush)
+        write_behind.toggle_like(self.articles[1].pk, self.reader.pk)
+        results = self.client.get("/articles/trending/").data["results"]
+        self.assertEqual(results[0]["likes_count"], 1)
+        self.assertIn(results[0], self.client.get("/articles/").data["results"])
+
+    def scores(self):
+        return dict(TrendingScore.objects.values_list("article", "score"))
+
+    def test_decay(self):
+        # 반감기(TRENDING_HALF_LIFE_HOURS)마다 절반, TRENDING_MIN_SCORE 미만은 지운다
+        with self.settings(TRENDING_HALF_LIFE_HOURS=6, TRENDING_MIN_SCORE=0.01):
+            self.assertEqual(trending.decay(6), (3, 1))
+        self.assertEqual(
+            self.scores(), {self.articles[0].pk: 1.0, self.articles[1].pk: 2.0}
+        )
+
+    def test_decay_command(self):
+        stdout = StringIO()
+        with self.settings(TRENDING_HALF_LIFE_HOURS=6, TRENDING_MIN_SCORE=0.01):
+            call_command("decay_trending", hours=12, stdout=stdout)
+        self.assertIn("3개 점수 감쇠, 1개 삭제 완료.", stdout.getvalue())
+        self.assertEqual(
+            self.scores(), {self.articles[0].pk: 0.5, self.articles[1].pk: 1.0}
+        )
+
+
+@override_settings(TIMELINE_FANOUT_LIMIT=2, TIMELINE_BACKFILL=2)
+class TimelineTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = create_user("reader")
+        cls.writer = create_user("writer")
+        cls.celebrity = create_user("celebrity")
+        add_follow(cls.reader.pk, cls.celebrity.pk)
+        for i in range(2):
+            add_follow(create_user(f"fan{i}").pk, cls.celebrity.pk)
+
+    def setUp(self):
+        cache.clear()
+        response = self.client.post(
+            "/accounts/api/token/", {"username": "reader", "password": "password"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def post(self, author, title):
+        return Article.objects.create(
+            author=author, title=title, content="본문", topic="game"
+        )
+
+    def entries(self):
+        return set(
+            TimelineEntry.objects.filter(user=self.reader).values_list(
+                "article", flat=True
+            )
+        )
+
+    def test_fan_out(self):
+        add_follow(self.reader.pk, self.writer.pk)
+        article = self.post(self.writer, "일반")
+        timeline.fan_out(article)
+        self.assertEqual(self.entries(), {article.pk})
+        # 팔로워가 TIMELINE_FANOUT_LIMIT 를 넘는 유저의 글은 뿌리지 않는다
+        timeline.fan_out(self.post(self.celebrity, "유명인"))
+        self.assertEqual(self.entries(), {article.pk})
+
+    def test_follow_backfills_and_unfollow_prunes(self):
+        articles = [self.post(self.writer, f"제목 {i}") for i in range(3)]
+        url = f"/accounts/{self.writer.pk}/follow/"
+        self.assertEqual(self.client.post(url).data["message"], "follow!")
+        # 최근 TIMELINE_BACKFILL 개만 채운다
+        self.assertEqual(self.entries(), {articles[1].pk, articles[2].pk})
+        self.assertEqual(self.client.post(url).data["message"], "unfollow!")
+        self.assertEqual(self.entries(), set())
+        self.assertEqual(self.client.put(url).data["affected"], 1)
+        self.assertEqual(len(self.entries()), 2)
+        self.assertEqual(self.client.delete(url).data["affected"], 1)
+        self.assertEqual(self.entries(), set())
+
+    def test_celebrity_posts_merged_on_read(self):
+        add_follow(self.reader.pk, self.writer.pk)
+        posts = []
+        for i in range(3):
+            posts.append(self.post(self.celebrity, f"유명인 {i}"))
+            posts.append(self.post(self.writer, f"일반 {i}"))
+            timeline.fan_out(posts[-1])
+        self.assertEqual(len(self.entries()), 3)
+        first = self.client.get("/accounts/timeline/?page_size=4").data
+        second = self.client.get(first["next"]).data
+        pks = [row["pk"] for row in first["results"] + second["results"]]
+        self.assertEqual(pks, sorted((post.pk for post in posts), reverse=True))
+        self.assertIsNone(second["next"])
+
+    def test_celebrities_counted_in_one_query(self):
+        followees = [self.writer.pk, self.celebrity.pk]
+        followees += [create_user(f"writer{i}").pk for i in range(3)]
+        with self.assertNumQueries(1):
+            self.assertEqual(timeline.celebrities(followees), [self.celebrity.pk])
+        # 다음 호출은 캐시에서 답한다
+        with self.assertNumQueries(0):
+            self.assertEqual(timeline.celebrities(followees), [self.celebrity.pk])
+
+
+class ArticleDetailAsyncTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        cls.readers = [create_user(f"reader{i}") for i in range(3)]
+        cls.article = Article.objects.create(
+            author=cls.author, title="제목", content="본문", topic="game"
+        )
+        cls.article.likes.add(*cls.readers)
+        Comment.objects.bulk_create(
+            Comment(
+                article=cls.article, author=(cls.readers[0], None)[i % 2], content="댓글"
+            )
+            for i in range(25)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_same_as_sync(self):
+        url = f"/articles/{self.author.pk}/{self.article.pk}/"
+        sync = self.client.get(url)
+        cache.clear()
+        response = self.client.get(url + "async/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, sync.content)
+        self.assertEqual(response.timings["queries"], 3)
+        # 캐시된 응답은 쿼리 없이 돌려준다
+        self.assertEqual(self.client.get(url + "async/").timings["queries"], 0)
+
+    def test_no_blocking_cache_calls(self):
+        # 이벤트 루프에서는 동기 캐시 API 를 부르지 않는다 (공유 캐시면 루프가 멈춘다)
+        url = f"/articles/{self.author.pk}/{self.article.pk}/async/"
+        blocking = [
+            "get_version",
+            "get_article_detail",
+            "recently_written",
+            "set_article_detail",
+        ]
+        token = self.client.post(
+            "/accounts/api/token/",
+            {"username": self.readers[0].username, "password": "password"},
+        ).data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        with ExitStack() as stack:
+            for name in blocking:
+                stack.enter_context(
+                    mock.patch(f"articles.views.{name}", side_effect=AssertionError)
+                )
+            stack.enter_context(
+                mock.patch("config.routers.is_pinned", side_effect=AssertionError)
+            )
+            self.assertEqual(self.client.get(url).status_code, 200)
+            self.assertEqual(self.client.get(url).status_code, 200)
+            # 없는 메서드는 (유저를 동기로 읽는) 쓰기 인증 전에 405
+            self.assertEqual(self.client.post(url).status_code, 405)
+
+    def test_not_found(self):
+        for url in [
+            f"/articles/{self.readers[0].pk}/{self.article.pk}/async/",
+            f"/articles/{self.author.pk}/0/async/",
+        ]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {"detail": "찾을 수 없습니다."})
+
+
+class ConditionalGetTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        cls.reader = create_user("reader")
+        cls.article = Article.objects.create(
+            author=cls.author, title="제목", content="본문", topic="game"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def like(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.filter(pk=self.article.pk).update(
+                likes_count=F("likes_count") + 1
+            )
+            invalidate_article(self.article.pk)
+
+    def assertRevalidates(self, url, queries):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(cached["ETag"], etag)
+        self.assertEqual(cached.timings["queries"], queries)
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+        # 좋아요 수가 바뀌면 새 ETag 로 200
+        self.like()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_detail(self):
+        base = f"/articles/{self.author.pk}/{self.article.pk}/"
+        for url in [base, base + "async/"]:
+            with self.subTest(url=url):
+                self.assertRevalidates(url, queries=0)
+
+    def test_detail_checks_author(self):
+        path = f"{self.author.pk + self.reader.pk}/{self.article.pk}/"
+        for suffix in ["", "async/"]:
+            url = f"/articles/{self.author.pk}/{self.article.pk}/{suffix}"
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                headers = {
+                    "HTTP_IF_NONE_MATCH": response["ETag"],
+                    "HTTP_IF_MODIFIED_SINCE": response["Last-Modified"],
+                }
+                # 작성자가 다른 URL 은 검증 값이 맞아도 404
+                wrong = self.client.get(f"/articles/{path}{suffix}", **headers)
+                self.assertEqual(wrong.status_code, 404)
+                # 상세 캐시가 없으면 DB 로 작성자를 확인한 뒤 304
+                with mock.patch(
+                    "articles.views.get_article_detail", return_value=None
+                ), mock.patch("articles.views.aget_article_detail", return_value=None):
+                    response = self.client.get(url, **headers)
+                    self.assertEqual(response.status_code, 304)
+                    wrong = self.client.get(f"/articles/{path}{suffix}", **headers)
+                    self.assertEqual(wrong.status_code, 404)
+
+    def test_listing(self):
+        for url in ["/articles/?ordering=likes", f"/articles/{self.author.pk}/"]:
+            with self.subTest(url=url):
+                self.assertRevalidates(url, queries=1)
+
+    def test_listing_etag_depends_on_query(self):
+        etags = {
+            self.client.get(url)["ETag"]
+            for url in ["/articles/", "/articles/?topic=game", "/articles/?page_size=5"]
+        }
+        self.assertEqual(len(etags), 3)
+
+
+@override_settings(REPLICA_DATABASES=["replica1"])
+class ReplicaRoutingTest(APITransactionTestCase):
+    # primary 테스트 DB 를 그대로 보는 replica1 (TEST MIRROR 와 같은 설정) 을 붙여
+    # 조회가 replica 로 가고, 쓰기 직후에는 그 유저의 조회가 primary 로 고정되는지 본다
+    # 테스트 러너가 따로 만들지 않도록 클래스 준비가 끝난 뒤에 연결을 추가한다
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        connections.settings["replica1"] = {
+            **connections["default"].settings_dict,
+            "TEST": {"MIRROR": "default"},
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        connections["replica1"].close()
+        del connections["replica1"]
+        del connections.settings["replica1"]
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.author = create_user("author")
+        self.reader = create_user("reader")
+        self.article = Article.objects.create(
+            author=self.author, title="제목", content="본문", topic="game"
+        )
+
+    def queries(self, method, url, user=None):
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections["replica1"]) as replica:
+                response = getattr(self.client, method)(url)
+        self.assertEqual(response.status_code, 200)
+        return len(primary), len(replica)
+
+    def test_reads_go_to_replica_until_write(self):
+        base = f"/articles/{self.author.pk}/{self.article.pk}/"
+        primary, replica = self.queries("get", "/articles/", self.reader)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+        # 쓰기는 primary 로
+        primary, replica = self.queries("post", base + "likes/", self.reader)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+        # 방금 쓴 유저의 조회는 primary, 다른 유저는 그대로 replica
+        primary, replica = self.queries("get", "/articles/", self.reader)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+        primary, replica = self.queries("get", "/articles/", self.author)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_recently_written_article_reads_primary(self):
+        # 복제 지연 안에 바뀐 게시글의 상세는 캐시되지 않은 상태에서 primary 로 읽는다
+        base = f"/articles/{self.author.pk}/{self.article.pk}/"
+        primary, replica = self.queries("get", base)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+        Article.objects.filter(pk=self.article.pk).update(title="새 제목")
+        invalidate_article(self.article.pk)
+        primary, replica = self.queries("get", base)
+        self.assertGreater(primary, 0)
+
+    def test_router(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Article), "default")
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Article), "replica1")
+            self.assertEqual(router.db_for_write(Article), "default")
+        self.assertFalse(router.allow_migrate("replica1", "articles"))
+
+
+class ImportForumTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "forum.jsonl")
+        self.password_hash = make_password("secret")
+
+    def write(self, records):
+        with open(self.path, "w") as f:
+            for record in records:
+                f.write(record if isinstance(record, str) else json.dumps(record))
+                f.write("\n")
+
+    def run_import(self, **options):
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_forum", self.path, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def user(self, pk, name, **extra):
+        return {
+            "type": "user",
+            "id": pk,
+            "username": name,
+            "email": f"{name}@example.com",
+            "nickname": name,
+            "fullname": name,
+            **extra,
+        }
+
+    def article(self, pk, author, **extra):
+        return {
+            "type": "article",
+            "id": pk,
+            "author": author,
+            "title": f"제목 {pk}",
+            "content": "본문",
+            "topic": "game",
+            **extra,
+        }
+
+    def records(self):
+        return [
+            self.user(10, "alice", password_hash=self.password_hash),
+            self.user(11, "bob", password="plain-password"),
+            self.article(
+                100,
+                10,
+                created_at="2020-01-01T09:00:00",
+                updated_at="2020-01-02T09:00:00",
+            ),
+            # 다음 청크에서 앞 청크의 유저 / 게시글을 참조한다
+            self.article(101, 11),
+            self.article(102, 99),
+            {
+                "type": "comment",
+                "id": 1000,
+                "article": 100,
+                "author": 11,
+                "content": "댓글",
+            },
+            {
+                "type": "comment",
+                "id": 1001,
+                "article": 100,
+                "content": "익명",
+                "password": "pw",
+            },
+            {
+                "type": "comment",
+                "id": 1002,
+                "article": 999,
+                "author": 10,
+                "content": "댓글",
+            },
+            {"type": "like", "user": 11, "article": 100},
+            {"type": "like", "user": 10, "article": 101},
+            {"type": "like", "user": 11, "article": 999},
+            {"type": "follow", "follower": 10, "followee": 11},
+            "{깨진 줄",
+            {"type": "poll", "id": 1},
+        ]
+
+    def test_import(self):
+        self.write(self.records())
+        stdout, stderr = self.run_import(chunk_size=3)
+        self.assertIn("가져오기 완료", stdout)
+        alice = get_user_model().objects.get(pk=10)
+        # 미리 해시된 비밀번호는 그대로 저장한다
+        self.assertEqual(alice.password, self.password_hash)
+        self.assertTrue(alice.check_password("secret"))
+        self.assertTrue(
+            get_user_model().objects.get(pk=11).check_password("plain-password")
+        )
+        # 외래키가 없는 레코드는 그 줄만 오류로 남기고 건너뛴다
+        self.assertEqual(set(Article.objects.values_list("pk", flat=True)), {100, 101})
+        self.assertEqual(
+            set(Comment.objects.values_list("pk", flat=True)), {1000, 1001}
+        )
+        for lineno in [5, 8, 11, 13, 14]:
+            self.assertIn(f"{lineno}번째 줄", stderr)
+        # 좋아요 / 댓글 수는 가져온 뒤 다시 계산한다
+        article = Article.objects.get(pk=100)
+        self.assertEqual((article.likes_count, article.comments_count), (1, 2))
+        self.assertEqual(Article.objects.get(pk=101).likes_count, 1)
+        # 원본 시각을 auto_now 가 덮어쓰지 않는다
+        self.assertEqual(article.updated_at, datetime(2020, 1, 2, 9))
+        self.assertTrue(alice.followers.filter(pk=11).exists())
+        self.assertFalse(os.path.exists(self.path + ".checkpoint"))
+
+    def test_resume_from_checkpoint(self):
+        self.write(self.records())
+        # 두 번째 청크를 커밋한 뒤 체크포인트를 쓰기 전에 중단된 경우
+        save_checkpoint = ImportCommand.save_checkpoint
+        calls = []
+
+        def crash(command, checkpoint, state):
+            calls.append(state)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+            save_checkpoint(command, checkpoint, state)
+
+        with mock.patch.object(ImportCommand, "save_checkpoint", crash):
+            with self.assertRaises(KeyboardInterrupt):
+                self.run_import(chunk_size=3)
+        self.assertTrue(Article.objects.filter(pk=101).exists())
+        with open(self.path + ".checkpoint") as f:
+            self.assertEqual(json.load(f)["line"], 3)
+        # 첫 청크 뒤부터 다시 읽고, 이미 들어간 두 번째 청크의 pk 는 건너뛴다
+        stdout, _ = self.run_import(chunk_size=3)
+        self.assertIn("3번째 줄부터 이어서", stdout)
+        self.assertIn("건너뜀 2", stdout)
+        self.assertEqual(get_user_model().objects.count(), 2)
+        self.assertEqual(set(Article.objects.values_list("pk", flat=True)), {100, 101})
+        article = Article.objects.get(pk=100)
+        self.assertEqual((article.likes_count, article.comments_count), (1, 2))
+
+
+class CommentPasswordTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.article = Article.objects.create(
+            author=create_user("author"), title="제목", content="본문", topic="game"
+        )
+
+    def comment(self, password):
+        return Comment.objects.create(
+            article=self.article, content="익명", password=password
+        )
+
+    def test_account_hashers_reject_comment_hash(self):
+        encoded = make_comment_password("pw")
+        self.assertTrue(encoded.startswith("comment_pbkdf2_sha256$"))
+        self.assertTrue(check_comment_password("pw", self.comment(encoded)))
+        self.assertFalse(check_password("pw", encoded))
+
+    def test_legacy_hash_upgraded(self):
+        comment = self.comment(make_password("pw", hasher="pbkdf2_sha1"))
+        self.assertFalse(check_comment_password("wrong", comment))
+        comment.refresh_from_db()
+        self.assertTrue(comment.password.startswith("pbkdf2_sha1$"))
+        self.assertTrue(check_comment_password("pw", comment))
+        comment.refresh_from_db()
+        self.assertTrue(comment.password.startswith("comment_pbkdf2_sha256$"))
+        self.assertTrue(check_comment_password("pw", comment))
+
+    def test_iterations_change_rehashes(self):
+        with self.settings(COMMENT_PASSWORD_ITERATIONS=1000):
+            comment = self.comment(make_comment_password("pw"))
+            with self.assertNumQueries(0):
+                self.assertTrue(check_comment_password("pw", comment))
+        with self.settings(COMMENT_PASSWORD_ITERATIONS=2000):
+            with self.assertNumQueries(0):
+                self.assertFalse(check_comment_password("wrong", comment))
+            self.assertTrue(check_comment_password("pw", comment))
+        comment.refresh_from_db()
+        self.assertTrue(comment.password.startswith("comment_pbkdf2_sha256$2000$"))
+
+
+class SlidingWindowThrottleTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = 1000 * 60.0
+        self.request = RequestFactory().post("/", REMOTE_ADDR="10.0.0.1")
+        self.request.user = AnonymousUser()
+
+    def throttle(self):
+        throttle = CommentPasswordRateThrottle()
+        throttle.rate = "3/min"
+        throttle.num_requests, throttle.duration = 3, 60
+        throttle.timer = lambda: self.now
+        return throttle
+
+    def allowed(self, requests):
+        return sum(
+            self.throttle().allow_request(self.request, None) for _ in range(requests)
+        )
+
+    def test_window_slides(self):
+        self.assertEqual(self.allowed(5), 3)
+        throttle = self.throttle()
+        self.assertFalse(throttle.allow_request(self.request, None))
+        self.assertEqual(throttle.wait(), 60 + 60 * (1 - 2 / 3))
+        # 다음 창의 1/2 지점: 이전 창 3개의 절반 1.5 + 1 <= 3
+        self.now += 90
+        self.assertEqual(self.allowed(2), 1)
+        # 다른 IP 는 따로 센다
+        self.request.META["REMOTE_ADDR"] = "10.0.0.2"
+        self.assertEqual(self.allowed(5), 3)
+
+    def test_concurrent_requests_are_counted_once(self):
+        throttle = self.throttle()
+        throttle.rate = "50/min"
+        throttle.num_requests = 50
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            allowed = list(
+                pool.map(
+                    lambda _: throttle.allow_request(self.request, None), range(200)
+                )
+            )
+        self.assertEqual(sum(allowed), 50)
+
+    def test_overhead(self):
+        throttle = self.throttle()
+        throttle.num_requests = 10**9
+        started = time.perf_counter()
+        for _ in range(1000):
+            throttle.allow_request(self.request, None)
+        self.assertLess((time.perf_counter() - started) / 1000, 0.001)
+
+
+class EndpointThrottleTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        cls.reader = create_user("reader")
+        cls.article = Article.objects.create(
+            author=cls.author, title="제목", content="본문", topic="game"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    @mock.patch.object(
+        SlidingWindowRateThrottle,
+        "THROTTLE_RATES",
+        {"like": "2/min", "comment_create": "2/min", "comment_password": "2/min"},
+    )
+    def test_write_scopes(self):
+        url = f"/articles/{self.author.pk}/{self.article.pk}/"
+        self.client.force_authenticate(self.reader)
+        statuses = [self.client.post(url + "likes/").status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+        # 조회는 제한하지 않는다
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.force_authenticate(None)
+        statuses = [
+            self.client.post(
+                url, {"content": "익명", "password": "pw"}, format="json"
+            ).status_code
+            for _ in range(3)
+        ]
+        self.assertEqual(statuses, [200, 200, 429])
+        response = self.client.post(url, {"content": "익명"}, format="json")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+
+class LikeBulkTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        cls.reader = create_user("reader")
+        cls.articles = Article.objects.bulk_create(
+            Article(author=cls.author, title=f"제목 {i}", content="본문", topic="game")
+            for i in range(4)
+        )
+        cls.own = Article.objects.create(
+            author=cls.reader, title="내 글", content="본문", topic="game"
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.reader)
+
+    def bulk(self, like=(), unlike=()):
+        response = self.client.post(
+            "/articles/likes/", {"like": like, "unlike": unlike}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def scores(self):
+        return dict(TrendingScore.objects.values_list("article", "score"))
+
+    def test_like_and_unlike(self):
+        first, second, third, fourth = [article.pk for article in self.articles]
+        data = self.bulk(like=[first, second, self.own.pk])
+        # 자기 글은 좋아요하지 않는다
+        self.assertEqual(data["like"], [first, second])
+        self.assertEqual(self.scores(), {first: 1.0, second: 1.0})
+        data = self.bulk(like=[second, third], unlike=[first, fourth])
+        self.assertEqual(data["unlike"], [first, fourth])
+        self.assertEqual(
+            set(self.reader.likes.values_list("pk", flat=True)),
+            {second, third},
+        )
+        counts = dict(Article.objects.values_list("pk", "likes_count"))
+        self.assertEqual(
+            counts, {first: 0, second: 1, third: 1, fourth: 0, self.own.pk: 0}
+        )
+        # 실제로 취소한 게시글만 점수가 내려가고, 이미 좋아요였던 게시글은 그대로
+        self.assertEqual(self.scores(), {first: 0.0, second: 1.0, third: 1.0})
+
+    def test_invalid(self):
+        response = self.client.post(
+            "/articles/likes/", {"like": [1], "unlike": [1]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class IdempotentLikeTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        cls.reader = create_user("reader")
+        cls.article = Article.objects.create(
+            author=cls.author, title="제목", content="본문", topic="game"
+        )
+        cls.url = f"/articles/{cls.author.pk}/{cls.article.pk}/likes/"
+
+    def setUp(self):
+        self.client.force_authenticate(self.reader)
+
+    def likes_count(self):
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, self.article.likes.count())
+        return self.article.likes_count
+
+    def test_put_and_delete(self):
+        affected = [self.client.put(self.url).data["affected"] for _ in range(2)]
+        self.assertEqual(affected, [1, 0])
+        self.assertEqual(self.likes_count(), 1)
+        # 토글은 현재 상태에서 출발한다
+        self.assertEqual(self.client.post(self.url).data["message"], "unlikes!")
+        self.assertEqual(self.client.delete(self.url).data["affected"], 0)
+        self.client.put(self.url)
+        affected = [self.client.delete(self.url).data["affected"] for _ in range(2)]
+        self.assertEqual(affected, [1, 0])
+        self.assertEqual(self.likes_count(), 0)
+
+    def test_own_article(self):
+        self.client.force_authenticate(self.author)
+        self.assertEqual(self.client.put(self.url).status_code, 403)
+        self.assertEqual(self.client.delete(self.url).status_code, 403)
+
+
+class ConcurrentLikeTest(TransactionTestCase):
+    # 같은 (게시글, 유저) 쌍에 좋아요 / 취소를 여러 스레드에서 동시에 보내도
+    # IntegrityError 없이 행은 최대 하나, 좋아요 수는 실제 행 수와 같아야 한다
+    def test_same_pair(self):
+        author = create_user("author")
+        reader = create_user("reader")
+        article = Article.objects.create(
+            author=author, title="제목", content="본문", topic="game"
+        )
+
+        def send(i):
+            try:
+                while True:
+                    try:
+                        with transaction.atomic():
+                            if i % 2:
+                                return add_like(article, reader.pk)
+                            return -remove_like(article, reader.pk)
+                    except OperationalError as error:
+                        # SQLite 메모리 테스트 DB (shared cache) 는 쓰기가 겹치면 기다리지 않고
+                        # "table is locked" 로 실패하므로 트랜잭션을 다시 시도한다
+                        if "locked" not in str(error):
+                            raise
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            affected = list(pool.map(send, range(200)))
+        article.refresh_from_db()
+        likes = article.likes.count()
+        self.assertIn(likes, (0, 1))
+        # 추가 / 삭제가 실제로 일어난 횟수만큼만 좋아요 수가 움직였다
+        self.assertEqual(sum(affected), likes)
+        self.assertEqual(article.likes_count, likes)
+
+
+@override_settings(WRITE_BEHIND=True)
+@mock.patch.object(write_behind.likes, "interval", None)
+@mock.patch.object(write_behind.follow_toggles, "interval", None)
+class WriteBehindTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = create_user("author")
+        cls.readers = [create_user(f"reader{i}") for i in range(3)]
+        cls.article = Article.objects.create(
+            author=cls.author, title="제목", content="본문", topic="game"
+        )
+        cls.url = f"/articles/{cls.author.pk}/{cls.article.pk}/"
+
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        write_behind.likes.flush()
+        write_behind.follow_toggles.flush()
+
+    def flush_likes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return write_behind.likes.flush()
+
+    def toggle_like(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.post(self.url + "likes/")
+        self.client.force_authenticate(None)
+        self.assertLessEqual(response.timings["queries"], 2)
+        return response.data["message"]
+
+    def likes_count(self):
+        return self.client.get(self.url).data["likes_count"]
+
+    def test_likes_are_collapsed_and_merged(self):
+        messages = [self.toggle_like(self.readers[0]) for _ in range(3)]
+        self.assertEqual(messages, ["likes!", "unlikes!", "likes!"])
+        self.toggle_like(self.readers[1])
+        self.toggle_like(self.readers[2])
+        self.toggle_like(self.readers[2])
+        # DB 에는 아직 없지만 응답에는 대기 중인 좋아요가 보인다
+        self.assertFalse(self.article.likes.exists())
+        self.assertEqual(self.likes_count(), 2)
+        self.assertEqual(
+            self.client.get("/articles/").data["results"][0]["likes_count"], 2
+        )
+        # 처음 상태로 돌아온 readers[2] 는 쓰지 않는다
+        self.assertEqual(self.flush_likes(), 2)
+        self.assertEqual(
+            set(self.article.likes.values_list("pk", flat=True)),
+            {self.readers[0].pk, self.readers[1].pk},
+        )
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 2)
+        self.assertEqual(self.likes_count(), 2)
+        self.assertEqual(self.flush_likes(), 0)
+        self.assertEqual(self.toggle_like(self.readers[0]), "unlikes!")
+        self.assertEqual(self.likes_count(), 1)
+
+    def test_failed_flush_is_retried(self):
+        self.toggle_like(self.readers[0])
+        with mock.patch.object(write_behind.likes, "apply", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                write_behind.likes.flush()
+        self.assertEqual(self.likes_count(), 1)
+        self.assertEqual(self.flush_likes(), 1)
+        self.assertTrue(self.article.likes.exists())
+
+    def test_bulk_uses_queue(self):
+        other = Article.objects.create(
+            author=self.author, title="제목", content="본문", topic="game"
+        )
+        self.toggle_like(self.readers[0])
+        self.client.force_authenticate(self.readers[0])
+        response = self.client.post(
+            "/articles/likes/",
+            {"like": [other.pk], "unlike": [self.article.pk]},
+            format="json",
+        )
+        self.assertEqual(response.data["unlike"], [self.article.pk])
+        # 대기 중인 좋아요가 명시적인 취소로 바뀐다
+        self.assertEqual(self.likes_count(), 0)
+        self.assertEqual(self.flush_likes(), 1)
+        self.assertFalse(self.article.likes.exists())
+        self.assertTrue(other.likes.filter(pk=self.readers[0].pk).exists())
+        self.assertEqual(self.likes_count(), 0)
+
+    def test_put_and_delete(self):
+        self.client.force_authenticate(self.readers[0])
+        url = self.url + "likes/"
+        affected = [self.client.put(url).data["affected"] for _ in range(2)]
+        self.assertEqual(affected, [1, 0])
+        self.assertEqual(self.likes_count(), 1)
+        self.assertEqual(self.client.delete(url).data["affected"], 1)
+        # 처음 상태로 돌아왔으므로 쓸 것이 없다
+        self.assertEqual(self.flush_likes(), 0)
+        self.assertEqual(self.likes_count(), 0)
+
+    def test_follows(self):
+        user, other = self.readers[:2]
+        user.followers.add(other)
+        self.client.force_authenticate(other)
+        url = f"/accounts/{user.pk}/follow/"
+        self.assertEqual(self.client.post(url).data["message"], "follow!")
+        self.client.force_authenticate(user)
+        # 대기 중인 팔로우로 맞팔로우가 되어 조회할 수 있다
+        self.assertEqual(
+            self.client.get(f"/accounts/{other.pk}/follow/").status_code, 200
+        )
+        self.assertEqual(write_behind.follow_toggles.flush(), 1)
+        self.assertTrue(other.followers.filter(pk=user.pk).exists())
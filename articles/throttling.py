@@ -0,0 +1,15 @@
+from config.throttling import SlidingWindowRateThrottle
+
+
+class CommentPasswordRateThrottle(SlidingWindowRateThrottle):
+    # 익명 댓글 비밀번호 해시 / 확인 횟수를 IP 별로 제한
+    scope = "comment_password"
+
+    def get_cache_key(self, request, view):
+        return f"ip:{self.get_ident(request)}"
+
+
+def throttle_password_check(request, view):
+    throttle = CommentPasswordRateThrottle()
+    if not throttle.allow_request(request, view):
+        view.throttled(request, throttle.wait())
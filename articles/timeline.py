@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from accounts.follow_graph import Follow
+
+from .models import Article, TimelineEntry
+from .pagination import cursor_int, decode_cursor, encode_cursor
+
+
+def _celebrity_key(user_pk):
+    return f"timeline:celebrity:{user_pk}"
+
+
+def is_celebrity(user_pk):
+    # 팔로워가 TIMELINE_FANOUT_LIMIT 를 넘으면 글 작성 시 팔로워에게 뿌리지 않는다
+    celebrity = cache.get(_celebrity_key(user_pk))
+    if celebrity is None:
+        limit = settings.TIMELINE_FANOUT_LIMIT
+        celebrity = Follow.objects.filter(to_user=user_pk)[limit : limit + 1].exists()
+        cache.set(
+            _celebrity_key(user_pk), celebrity, settings.TIMELINE_CELEBRITY_TIMEOUT
+        )
+    return celebrity
+
+
+def celebrities(user_pks):
+    # 캐시에 없는 유저들의 팔로워 수는 한 번의 GROUP BY 로 센다
+    keys = {_celebrity_key(pk): pk for pk in user_pks}
+    cached = cache.get_many(keys)
+    missing = [pk for key, pk in keys.items() if key not in cached]
+    if missing:
+        counted = set(
+            Follow.objects.filter(to_user__in=missing)
+            .values("to_user")
+            .annotate(followers=Count("pk"))
+            .filter(followers__gt=settings.TIMELINE_FANOUT_LIMIT)
+            .values_list("to_user", flat=True)
+        )
+        fresh = {_celebrity_key(pk): pk in counted for pk in missing}
+        cache.set_many(fresh, settings.TIMELINE_CELEBRITY_TIMEOUT)
+        cached.update(fresh)
+    return [pk for key, pk in keys.items() if cached[key]]
+
+
+def _insert(entries):
+    TimelineEntry.objects.bulk_create(
+        entries, batch_size=settings.TIMELINE_BATCH_SIZE, ignore_conflicts=True
+    )
+
+
+def fan_out(article):
+    # 새 글을 작성자의 팔로워 타임라인에 배치 INSERT 로 넣는다
+    if is_celebrity(article.author_id):
+        return
+    followers = Follow.objects.filter(to_user=article.author_id).values_list(
+        "from_user", flat=True
+    )
+    batch = []
+    for follower in followers.iterator(chunk_size=settings.TIMELINE_BATCH_SIZE):
+        batch.append(
+            TimelineEntry(
+                user_id=follower, article=article, author_id=article.author_id
+            )
+        )
+        if len(batch) >= settings.TIMELINE_BATCH_SIZE:
+            _insert(batch)
+            batch = []
+    _insert(batch)
+
+
+def backfill(user_pk, author_pk):
+    # 팔로우 직후 상대의 최근 글을 타임라인에 채운다
+    if is_celebrity(author_pk):
+        return
+    articles = (
+        Article.objects.filter(author=author_pk)
+        .order_by("-pk")
+        .values_list("pk", flat=True)[: settings.TIMELINE_BACKFILL]
+    )
+    _insert(
+        [
+            TimelineEntry(user_id=user_pk, article_id=pk, author_id=author_pk)
+            for pk in articles
+        ]
+    )
+
+
+def prune(user_pk, author_pk):
+    TimelineEntry.objects.filter(user=user_pk, author=author_pk).delete()
+
+
+def timeline_page(user_pk, cursor=None, size=20):
+    # 미리 넣어둔 타임라인과 팔로워가 많은 유저의 글(읽을 때 조회)을 pk 역순으로 합친다
+    before = decode_cursor(cursor, (cursor_int,))[0][0] if cursor else None
+    entries = TimelineEntry.objects.filter(user=user_pk)
+    if before is not None:
+        entries = entries.filter(article__lt=before)
+    pks = set(
+        entries.order_by("-article").values_list("article", flat=True)[: size + 1]
+    )
+
+    followees = Follow.objects.filter(from_user=user_pk).values_list(
+        "to_user", flat=True
+    )
+    authors = celebrities(followees)
+    if authors:
+        articles = Article.objects.filter(author__in=authors)
+        if before is not None:
+            articles = articles.filter(pk__lt=before)
+        pks.update(articles.order_by("-pk").values_list("pk", flat=True)[: size + 1])
+
+    pks = sorted(pks, reverse=True)
+    next_cursor = encode_cursor([pks[size - 1]]) if len(pks) > size else None
+    return pks[:size], next_cursor
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from .models import TrendingScore
+
+
+def bump(article, weight):
+    # 점수에 가중치를 바로 더한다 (행이 없으면 새로 만든다)
+    scores = TrendingScore.objects.filter(article=article.pk)
+    if scores.update(score=Greatest(F("score") + weight, Value(0.0))):
+        return
+    if weight <= 0:
+        return
+    _, created = TrendingScore.objects.get_or_create(
+        article_id=article.pk, defaults={"topic": article.topic, "score": weight}
+    )
+    if not created:
+        scores.update(score=F("score") + weight)
+
+
+def bump_many(articles, weight):
+    # 여러 게시글에 같은 가중치를 더한다 (게시글 수와 상관없이 쿼리 3번)
+    # 동시에 다른 요청이 같은 행을 만들면 이번 가중치는 버려진다 (인기 점수라 허용)
+    pks = [article.pk for article in articles]
+    scores = TrendingScore.objects.filter(article__in=pks)
+    if weight <= 0:
+        # 빼는 경우는 행을 만들지 않으므로 갱신만 한다
+        scores.update(score=Greatest(F("score") + weight, Value(0.0)))
+        return
+    existing = set(scores.values_list("article", flat=True))
+    scores.update(score=Greatest(F("score") + weight, Value(0.0)))
+    TrendingScore.objects.bulk_create(
+        [
+            TrendingScore(article_id=article.pk, topic=article.topic, score=weight)
+            for article in articles
+            if article.pk not in existing
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def like(article, count=1):
+    bump(article, settings.TRENDING_LIKE_WEIGHT * count)
+
+
+def like_many(articles, count=1):
+    if articles:
+        bump_many(articles, settings.TRENDING_LIKE_WEIGHT * count)
+
+
+def comment(article, count=1):
+    bump(article, settings.TRENDING_COMMENT_WEIGHT * count)
+
+
+def move_topic(article):
+    TrendingScore.objects.filter(article=article.pk).update(topic=article.topic)
+
+
+def decay(hours):
+    # 반감기 기준 지수 감쇠, 너무 작아진 점수는 지워서 테이블 크기를 유지한다
+    factor = 0.5 ** (hours / settings.TRENDING_HALF_LIFE_HOURS)
+    decayed = TrendingScore.objects.update(score=F("score") * factor)
+    pruned, _ = TrendingScore.objects.filter(
+        score__lt=settings.TRENDING_MIN_SCORE
+    ).delete()
+    return decayed, pruned
+
+
+def top(limit, topic=None):
+    # (topic, -score) 인덱스를 앞에서부터 limit 개만 읽어 게시글 pk 를 점수 순으로 돌려준다
+    scores = TrendingScore.objects.order_by("-score", "article")
+    if topic:
+        scores = scores.filter(topic=topic)
+    return scores.values_list("article", flat=True)[:limit]
@@ -1,15 +1,46 @@
 from django.urls import path
-from .views import ArticleDetailAPI, ArticleListAPI, CommentAPI, LikeAPI
+from .views import (
+    ArticleCommentListAPI,
+    ArticleDetailAPI,
+    ArticleDetailAsyncAPI,
+    ArticleExportAPI,
+    ArticleListAPI,
+    ArticleSearchAPI,
+    CommentAPI,
+    LikeAPI,
+    LikeBulkAPI,
+    TrendingArticleAPI,
+)
 
 urlpatterns = [
     # 모든 게시글 조회 / 게시글 생성
     path("", ArticleListAPI.as_view(), name="articles_all"),
+    # 게시글 검색
+    path("search/", ArticleSearchAPI.as_view(), name="articles_search"),
+    # 인기 게시글 조회
+    path("trending/", TrendingArticleAPI.as_view(), name="articles_trending"),
+    # 게시글 내보내기 (관리자)
+    path("export/", ArticleExportAPI.as_view(), name="articles_export"),
+    # 좋아요 일괄 처리
+    path("likes/", LikeBulkAPI.as_view(), name="likes_bulk"),
     # 유저 게시글 조회
     path("<int:pk>/", ArticleListAPI.as_view(), name="articles_user"),
     # 게시글 상세 / 수정 / 삭제 or 댓글 생성
     path(
         "<int:author_pk>/<int:article_pk>/", ArticleDetailAPI.as_view(), name="article"
     ),
+    # 게시글 상세 (async, ASGI 용)
+    path(
+        "<int:author_pk>/<int:article_pk>/async/",
+        ArticleDetailAsyncAPI.as_view(),
+        name="article_async",
+    ),
+    # 댓글 목록 조회
+    path(
+        "<int:author_pk>/<int:article_pk>/comments/",
+        ArticleCommentListAPI.as_view(),
+        name="article_comments",
+    ),
     # 댓글 수정 / 삭제
     path(
         "<int:author_pk>/<int:article_pk>/<int:comment_pk>/",
@@ -1,36 +1,127 @@
+import asyncio
+from contextlib import nullcontext
+
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Prefetch
-from django.contrib.auth.hashers import make_password, check_password
-from .models import Article, Comment
+from django.db import transaction
+from django.db.models import F, Prefetch
+from .cache import (
+    aget_article_detail,
+    aget_version,
+    arecently_written,
+    aset_article_detail,
+    get_article_detail,
+    get_version,
+    invalidate_article,
+    recently_written,
+    set_article_detail,
+)
+from .conditional import (
+    detail_validators,
+    listing_validators,
+    not_modified,
+    set_validators,
+)
+from .export import (
+    OUTPUTS,
+    export_queryset,
+    export_rows,
+    parse_moment,
+    to_csv,
+    to_ndjson,
+)
+from .hashers import check_comment_password, make_comment_password
+from .models import TOPIC_CHOICES, Article, Comment
+from .pagination import (
+    KeysetPagination,
+    cursor_float,
+    cursor_int,
+    decode_cursor,
+    encode_cursor,
+)
+from .search import get_search_backend
+from . import likes, timeline, trending, write_behind
+from .throttling import throttle_password_check
 from .serializers import (
     ArticleCreateSerializer,
     ArticleDetailSerializer,
-    ArticleListSerializer,
+    ArticleListRowSerializer,
     CommentCreateSerializer,
-    CommentListSerializer,
+    CommentListRowSerializer,
+    LikeBulkSerializer,
+    likers_preview,
 )
 from drf_yasg.utils import swagger_auto_schema
+from config.async_views import AsyncAPIView, alist
+from config.routers import ReplicaReadMixin, replica_reads
+from .write_behind import is_mutual, merge_likes
+
+
+def comments_preview():
+    # 댓글은 앞의 일부만 포함하고 나머지는 댓글 목록 API 로 조회
+    return (
+        Comment.objects.select_related("author")
+        .only("article", "content", "author__nickname", "created_at")
+        .order_by("created_at", "pk")
+    )
 
 
-class ArticleListAPI(APIView):
+class ArticleListAPI(ReplicaReadMixin, APIView):
+    # 메서드별 허용 쿼리 수 (테스트의 QueryBudgetAPIClient 가 넘으면 실패시킨다)
+    # 쓰기 메서드는 인증에서 유저를 확인하는 쿼리 1개를 포함한다
+    query_budget = {"GET": 2, "POST": 9}
+    throttle_scopes = {"POST": "article_create"}
+    pagination_class = KeysetPagination
+    # 정렬 기준별 키셋 (모두 인덱스 순서와 같다)
+    orderings = {
+        "recent": ("-updated_at", "-pk"),
+        "likes": ("-likes_count", "-pk"),
+        "comments": ("-comments_count", "-pk"),
+    }
+
     # (전체 / 유저) 게시글 목록 조회
     def get(self, request, pk=None, format=None):
-        if pk:
-            articles = Article.objects.filter(author=pk)
-        else:
-            articles = Article.objects
-        articles = (
-            articles.select_related("author")
-            .only("title", "topic", "author__nickname", "updated_at")
-            .annotate(likes_count=Count("likes"), comments_count=Count("comments"))
+        author = pk or request.query_params.get("author")
+        topic = request.query_params.get("topic")
+        ordering = request.query_params.get("ordering", "recent")
+        if ordering not in self.orderings:
+            return Response(
+                {"ordering": f"{', '.join(self.orderings)} 중 하나를 선택하세요."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        articles = Article.objects.all()
+        if author:
+            if not str(author).isdigit():
+                return Response(
+                    {"author": "잘못된 유저입니다."}, status=status.HTTP_400_BAD_REQUEST
+                )
+            articles = articles.filter(author=author)
+        if topic and topic != "all":
+            if topic not in dict(TOPIC_CHOICES):
+                return Response(
+                    {"topic": "잘못된 주제입니다."}, status=status.HTTP_400_BAD_REQUEST
+                )
+            articles = articles.filter(topic=topic)
+        # 바뀐 게 없으면 페이지를 조회하기 전에 304
+        etag, last_modified = listing_validators(request, articles)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        paginator = self.pagination_class(ordering=self.orderings[ordering])
+        page = paginator.paginate_queryset(
+            ArticleListRowSerializer.values(articles), request, view=self
         )
-        serializer = ArticleListSerializer(articles, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        serializer = ArticleListRowSerializer(page, many=True)
+        response = paginator.get_paginated_response(merge_likes(serializer.data))
+        return set_validators(response, etag, last_modified)
 
     # 게시글 생성
     @swagger_auto_schema(request_body=ArticleCreateSerializer)
@@ -39,28 +130,185 @@ class ArticleListAPI(APIView):
             return Response({"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
         serializer = ArticleCreateSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(author=request.user)
+            with transaction.atomic():
+                article = serializer.save(author_id=request.user.pk)
+                timeline.fan_out(article)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ArticleDetailAPI(APIView):
+class ArticleSearchAPI(APIView):
+    query_budget = {"GET": 2}
+
+    # 게시글 검색 (관련도 순)
+    def get(self, request, format=None):
+        query = request.query_params.get("q", "").strip()
+        topic = request.query_params.get("topic") or None
+        if not query:
+            return Response({"q": "검색어를 입력하세요."}, status=status.HTTP_400_BAD_REQUEST)
+        if topic == "all":
+            topic = None
+        elif topic and topic not in dict(TOPIC_CHOICES):
+            return Response({"topic": "잘못된 주제입니다."}, status=status.HTTP_400_BAD_REQUEST)
+        paginator = KeysetPagination()
+        size = paginator.get_page_size(request)
+        cursor = request.query_params.get(paginator.cursor_query_param)
+        after = decode_cursor(cursor, (cursor_float, cursor_int))[0] if cursor else None
+
+        hits = get_search_backend().search(query, topic, after, size + 1)
+        next_link = None
+        if len(hits) > size:
+            hits = hits[:size]
+            next_link = replace_query_param(
+                request.build_absolute_uri(),
+                paginator.cursor_query_param,
+                encode_cursor(hits[-1][::-1]),
+            )
+        articles = ArticleListRowSerializer.in_bulk(
+            Article.objects.all(), [pk for pk, _ in hits]
+        )
+        serializer = ArticleListRowSerializer(
+            [articles[pk] for pk, _ in hits if pk in articles], many=True
+        )
+        return Response(
+            {"next": next_link, "results": serializer.data}, status=status.HTTP_200_OK
+        )
+
+
+class TimelineAPI(APIView):
+    permission_classes = [IsAuthenticated]
+    # 팔로우한 유저 목록, 그중 팔로워가 많은 유저 판별(캐시가 비었을 때), 그들의 글을 더 읽는다
+    query_budget = {"GET": 5}
+
+    # 팔로우한 유저들의 게시글 타임라인 조회
+    def get(self, request, format=None):
+        paginator = KeysetPagination()
+        pks, next_cursor = timeline.timeline_page(
+            request.user.pk,
+            request.query_params.get(paginator.cursor_query_param),
+            paginator.get_page_size(request),
+        )
+        articles = ArticleListRowSerializer.in_bulk(Article.objects.all(), pks)
+        serializer = ArticleListRowSerializer(
+            [articles[pk] for pk in pks if pk in articles], many=True
+        )
+        next_link = None
+        if next_cursor:
+            next_link = replace_query_param(
+                request.build_absolute_uri(),
+                paginator.cursor_query_param,
+                next_cursor,
+            )
+        return Response(
+            {"next": next_link, "results": serializer.data}, status=status.HTTP_200_OK
+        )
+
+
+class TrendingArticleAPI(APIView):
+    query_budget = {"GET": 2}
+
+    # 인기 게시글 조회
+    def get(self, request, format=None):
+        topic = request.query_params.get("topic")
+        if topic == "all":
+            topic = None
+        elif topic and topic not in dict(TOPIC_CHOICES):
+            return Response({"topic": "잘못된 주제입니다."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = KeysetPagination().get_page_size(request)
+        pks = list(trending.top(limit, topic))
+        articles = ArticleListRowSerializer.in_bulk(Article.objects.all(), pks)
+        serializer = ArticleListRowSerializer(
+            [articles[pk] for pk in pks if pk in articles], many=True
+        )
+        return Response(
+            {"results": merge_likes(serializer.data)}, status=status.HTTP_200_OK
+        )
+
+
+class ArticleExportAPI(APIView):
+    permission_classes = [IsAdminUser]
+
+    # 게시글 (및 댓글) 전체 내보내기 (NDJSON / CSV 스트리밍)
+    # ?output=ndjson|csv&since=&until=&topic=&comments=1
+    def get(self, request, format=None):
+        params = request.query_params
+        output = params.get("output", "ndjson")
+        if output not in OUTPUTS:
+            return Response(
+                {"output": f"{', '.join(OUTPUTS)} 중 하나를 선택하세요."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            since = parse_moment(params["since"]) if params.get("since") else None
+            until = parse_moment(params["until"]) if params.get("until") else None
+        except ValueError:
+            return Response(
+                {"detail": "잘못된 날짜 형식입니다."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            articles = export_queryset(since, until, params.get("topic"))
+        except ValueError:
+            return Response({"topic": "잘못된 주제입니다."}, status=status.HTTP_400_BAD_REQUEST)
+        rows = export_rows(articles, comments=params.get("comments") in ("1", "true"))
+        if output == "csv":
+            response = StreamingHttpResponse(to_csv(rows), content_type="text/csv")
+        else:
+            response = StreamingHttpResponse(
+                to_ndjson(rows), content_type="application/x-ndjson"
+            )
+        response["Content-Disposition"] = f'attachment; filename="articles.{output}"'
+        return response
+
+
+class ArticleDetailAPI(ReplicaReadMixin, APIView):
+    query_budget = {"GET": 4, "POST": 11, "PUT": 6, "DELETE": 8}
+    throttle_scopes = {"POST": "comment_create"}
+
     # 게시글 상세 페이지
     def get(self, request, author_pk, article_pk, format=None):
-        article = get_object_or_404(
-            Article.objects.prefetch_related(
-                Prefetch(
-                    "comments__author",
-                    queryset=get_user_model().objects.only("nickname"),
+        version = get_version(article_pk)
+        etag, last_modified = detail_validators(article_pk, version)
+        payload = get_article_detail(article_pk, version)
+        if payload is not None:
+            if payload["author"]["pk"] != author_pk:
+                return Response(
+                    {"detail": "찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND
+                )
+            # 바뀐 게 없으면 DB 를 읽지 않고 304 (URL 의 작성자를 확인한 뒤에만)
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+            return set_validators(
+                Response(merge_likes([payload], "id")[0], status=status.HTTP_200_OK),
+                etag,
+                last_modified,
+            )
+        comments = comments_preview()
+        # 복제 지연 안에 바뀐 게시글은 primary 에서 읽어 예전 데이터가 캐시되지 않게 한다
+        reads = replica_reads(False) if recently_written(article_pk) else nullcontext()
+        with reads:
+            article = get_object_or_404(
+                Article.objects.prefetch_related(
+                    Prefetch(
+                        "comments",
+                        queryset=comments[: settings.ARTICLE_DETAIL_COMMENTS],
+                        to_attr="comments_preview",
+                    ),
                 ),
-                Prefetch("likes", queryset=get_user_model().objects.only("nickname")),
-            ),
-            author=author_pk,
-            pk=article_pk,
+                author=author_pk,
+                pk=article_pk,
+            )
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+            data = ArticleDetailSerializer(article).data
+        set_article_detail(article_pk, version, data)
+        return set_validators(
+            Response(merge_likes([data], "id")[0], status=status.HTTP_200_OK),
+            etag,
+            last_modified,
         )
-        serializer = ArticleDetailSerializer(article)
-        return Response(serializer.data, status=status.HTTP_200_OK)
 
     # (유저 / 익명 유저) 댓글 생성
     @swagger_auto_schema(request_body=CommentCreateSerializer)
@@ -71,7 +319,8 @@ class ArticleDetailAPI(APIView):
         if user:
             pass
         elif password:
-            password = make_password(password)
+            throttle_password_check(request, self)
+            password = make_comment_password(password)
             pass
         else:
             return Response(
@@ -79,7 +328,17 @@ class ArticleDetailAPI(APIView):
             )
         serializer = CommentCreateSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(article=article, author=user, password=password)
+            with transaction.atomic():
+                serializer.save(
+                    article=article,
+                    author_id=user.pk if user else None,
+                    password=password,
+                )
+                Article.objects.filter(pk=article.pk).update(
+                    comments_count=F("comments_count") + 1
+                )
+                invalidate_article(article.pk)
+                trending.comment(article)
             return Response(serializer.data, status=status.HTTP_200_OK)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -88,11 +347,13 @@ class ArticleDetailAPI(APIView):
     @swagger_auto_schema(request_body=ArticleDetailSerializer)
     def put(self, request, author_pk, article_pk, format=None):
         article = get_object_or_404(Article, pk=article_pk, author=author_pk)
-        if article.author != request.user:
+        if article.author_id != request.user.pk:
             return Response({"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
         serializer = ArticleCreateSerializer(article, data=request.data)
         if serializer.is_valid():
             serializer.save()
+            trending.move_topic(article)
+            invalidate_article(article.pk)
             return Response(serializer.data, status=status.HTTP_200_OK)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -100,31 +361,88 @@ class ArticleDetailAPI(APIView):
     # 게시글 삭제
     def delete(self, request, author_pk, article_pk, format=None):
         article = get_object_or_404(Article, pk=article_pk, author=author_pk)
-        if article.author != request.user:
+        if article.author_id != request.user.pk:
             return Response({"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
         article.delete()
+        invalidate_article(article_pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class CommentAPI(APIView):
+class ArticleDetailAsyncAPI(AsyncAPIView):
+    replica_methods = ("GET",)
+    query_budget = {"GET": 3}
+
+    # 게시글 상세 페이지 (async)
+    # 게시글 (좋아요 / 댓글 수는 게시글 행에 있음), 댓글 미리보기, 좋아요 유저 미리보기를 동시에 조회
+    async def get(self, request, author_pk, article_pk):
+        version = await aget_version(article_pk)
+        etag, last_modified = detail_validators(article_pk, version)
+        payload = await aget_article_detail(article_pk, version)
+        if payload is not None:
+            if payload["author"]["pk"] != author_pk:
+                raise NotFound()
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+            payload = merge_likes([payload], "id")[0]
+            return set_validators(self.render(payload), etag, last_modified)
+        reads = (
+            replica_reads(False)
+            if await arecently_written(article_pk)
+            else nullcontext()
+        )
+        with reads:
+            article, comments, likers = await asyncio.gather(
+                Article.objects.select_related("author").aget(
+                    author=author_pk, pk=article_pk
+                ),
+                alist(
+                    comments_preview().filter(article=article_pk)[
+                        : settings.ARTICLE_DETAIL_COMMENTS
+                    ]
+                ),
+                alist(likers_preview(article_pk)),
+            )
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        article.comments_preview = comments
+        article.likers_preview = likers
+        data = ArticleDetailSerializer(article).data
+        await aset_article_detail(article_pk, version, data)
+        data = merge_likes([data], "id")[0]
+        return set_validators(self.render(data), etag, last_modified)
+
+
+class ArticleCommentListAPI(APIView):
+    query_budget = {"GET": 2}
+
+    # 게시글 댓글 목록 조회
+    def get(self, request, author_pk, article_pk, format=None):
+        article = get_object_or_404(
+            Article.objects.only("pk"), author=author_pk, pk=article_pk
+        )
+        comments = CommentListRowSerializer.values(article.comments.all())
+        paginator = KeysetPagination(ordering=("created_at", "pk"))
+        page = paginator.paginate_queryset(comments, request, view=self)
+        serializer = CommentListRowSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class CommentAPI(ReplicaReadMixin, APIView):
+    query_budget = {"GET": 3, "PUT": 4, "DELETE": 7}
+
     # 유저의 댓글 목록 조회
     def get(self, request, pk, format=None):
         if not request.user.is_authenticated:
             return Response({"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
-        target = get_object_or_404(get_user_model(), pk=pk)
+        target = get_object_or_404(get_user_model().objects.only("pk"), pk=pk)
         user = request.user
-        if target != user:
-            if (target in user.followers.all()) and (user in target.followers.all()):
-                pass
-            else:
-                return Response(
-                    {"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN
-                )
-        serializer = CommentListSerializer(
-            target.comments.select_related("author").only(
-                "content", "author__nickname", "created_at"
-            ),
-            many=True,
+        # 맞팔로우일 때만 조회 가능
+        if target.pk != user.pk and not is_mutual(user.pk, target.pk):
+            return Response({"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
+        serializer = CommentListRowSerializer(
+            CommentListRowSerializer.values(target.comments.all()), many=True
         )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -134,15 +452,16 @@ class CommentAPI(APIView):
         article = get_object_or_404(Article, pk=article_pk, author=author_pk)
         comment = get_object_or_404(Comment, pk=comment_pk)
         user = request.user if request.user.is_authenticated else None
-        if comment.author:
-            if comment.author != user:
+        if comment.author_id:
+            if comment.author_id != (user.pk if user else None):
                 return Response(
                     {"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN
                 )
         else:
             password = request.data.pop("password", None)
             if password:
-                if check_password(password, comment.password):
+                throttle_password_check(request, self)
+                if check_comment_password(password, comment):
                     pass
                 else:
                     return Response(
@@ -157,6 +476,7 @@ class CommentAPI(APIView):
         serializer = CommentCreateSerializer(comment, data=request.data)
         if serializer.is_valid():
             serializer.save()
+            invalidate_article(comment.article_id)
             return Response(serializer.data, status=status.HTTP_200_OK)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -167,18 +487,19 @@ class CommentAPI(APIView):
         comment = get_object_or_404(Comment, pk=comment_pk)
         user = request.user if request.user.is_authenticated else None
         # 게시글의 저자는 익명 댓글 삭제 가능
-        if comment.author:
-            if comment.author != user:
+        if comment.author_id:
+            if comment.author_id != (user.pk if user else None):
                 return Response(
                     {"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN
                 )
         else:
-            if article.author == user:
+            if user and article.author_id == user.pk:
                 pass
             else:
                 password = request.data.pop("password", None)
                 if password:
-                    if check_password(password, comment.password):
+                    throttle_password_check(request, self)
+                    if check_comment_password(password, comment):
                         pass
                     else:
                         return Response(
@@ -190,22 +511,122 @@ class CommentAPI(APIView):
                         {"detail": "로그인하거나 비밀번호를 입력하세요."},
                         status=status.HTTP_400_BAD_REQUEST,
                     )
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
+            Article.objects.filter(pk=comment.article_id).update(
+                comments_count=F("comments_count") - 1
+            )
+            invalidate_article(comment.article_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class LikeAPI(APIView):
     permission_classes = [IsAuthenticated]
+    # 게시글의 첫 좋아요는 인기 점수 행을 새로 만든다
+    query_budget = {"POST": 12, "PUT": 12, "DELETE": 7}
+    throttle_scopes = {"POST": "like", "PUT": "like", "DELETE": "like"}
+
+    def get_article(self, request, author_pk, article_pk):
+        article = get_object_or_404(
+            Article.objects.only("author", "topic"), pk=article_pk, author=author_pk
+        )
+        if article.author_id == request.user.pk:
+            raise PermissionDenied("권한이 없습니다.")
+        return article
 
     # 좋아요 하기 / 취소
     def post(self, request, author_pk, article_pk, format=None):
-        article = get_object_or_404(Article, pk=article_pk, author=author_pk)
+        article = self.get_article(request, author_pk, article_pk)
         user = request.user
-        if article.author == user:
-            return Response({"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
-        if article in user.likes.all():
-            user.likes.remove(article)
-            return Response({"message": "unlikes!"}, status=status.HTTP_200_OK)
+        if settings.WRITE_BEHIND:
+            # DB 쓰기 없이 대기열에 기록만 하고 응답한다
+            liked = write_behind.toggle_like(article.pk, user.pk)
         else:
-            user.likes.add(article)
-            return Response({"message": "likes!"}, status=status.HTTP_200_OK)
+            with transaction.atomic():
+                liked = likes.toggle_like(article, user.pk)
+        message = "likes!" if liked else "unlikes!"
+        return Response({"message": message}, status=status.HTTP_200_OK)
+
+    # 좋아요 하기 (이미 좋아요 상태면 그대로 두고 affected 0)
+    def put(self, request, author_pk, article_pk, format=None):
+        article = self.get_article(request, author_pk, article_pk)
+        user = request.user
+        if settings.WRITE_BEHIND:
+            affected = int(write_behind.set_like(article.pk, user.pk, True))
+        else:
+            with transaction.atomic():
+                affected = likes.add_like(article, user.pk)
+        return Response(
+            {"message": "likes!", "affected": affected}, status=status.HTTP_200_OK
+        )
+
+    # 좋아요 취소 (좋아요 상태가 아니면 affected 0)
+    def delete(self, request, author_pk, article_pk, format=None):
+        article = self.get_article(request, author_pk, article_pk)
+        user = request.user
+        if settings.WRITE_BEHIND:
+            affected = int(write_behind.set_like(article.pk, user.pk, False))
+        else:
+            with transaction.atomic():
+                affected = likes.remove_like(article, user.pk)
+        return Response(
+            {"message": "unlikes!", "affected": affected}, status=status.HTTP_200_OK
+        )
+
+
+class LikeBulkAPI(APIView):
+    permission_classes = [IsAuthenticated]
+    query_budget = {"POST": 12}
+    throttle_scopes = {"POST": "like"}
+
+    # 여러 게시글 좋아요 / 취소 한 번에 처리
+    @swagger_auto_schema(request_body=LikeBulkSerializer)
+    def post(self, request, format=None):
+        serializer = LikeBulkSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        user = request.user
+        like_targets = list(
+            Article.objects.filter(pk__in=serializer.validated_data["like"])
+            .exclude(author=user.pk)
+            .only("topic")
+        )
+        like_pks = [article.pk for article in like_targets]
+        unlike_pks = serializer.validated_data["unlike"]
+        if settings.WRITE_BEHIND:
+            # 대기 중인 토글 위에 게시글마다 최종 상태를 기록한다
+            # (DB 에 바로 쓰면 다음 반영 때 대기 중인 토글이 덮어쓴다)
+            write_behind.set_likes(user.pk, like_pks, unlike_pks)
+            return Response(
+                {"like": sorted(like_pks), "unlike": sorted(unlike_pks)},
+                status=status.HTTP_200_OK,
+            )
+        Like = Article.likes.through
+        # 좋아요 / 취소 전의 상태 (실제로 바뀐 게시글만 인기 점수를 바꾼다)
+        liked = set(
+            Like.objects.filter(
+                user=user.pk, article__in=like_pks + unlike_pks
+            ).values_list("article", flat=True)
+        )
+        with transaction.atomic():
+            Like.objects.bulk_create(
+                [Like(article_id=pk, user_id=user.pk) for pk in like_pks],
+                ignore_conflicts=True,
+            )
+            Like.objects.filter(user=user.pk, article__in=unlike_pks).delete()
+            # 이미 좋아요 / 취소 상태였던 게시글이 섞여 있으므로 증감 대신 재계산
+            changed = set(like_pks) | set(unlike_pks)
+            Article.objects.filter(pk__in=changed).recount()
+            for pk in changed:
+                invalidate_article(pk)
+            trending.like_many(
+                [article for article in like_targets if article.pk not in liked]
+            )
+            # 취소는 점수 행을 만들지 않으므로 pk 만 있으면 된다
+            trending.like_many(
+                [Article(pk=pk) for pk in unlike_pks if pk in liked], count=-1
+            )
+        return Response(
+            {"like": sorted(like_pks), "unlike": sorted(unlike_pks)},
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,166 @@
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+
+from accounts.follow_graph import Follow, follows
+from accounts.follow_graph import ais_mutual as _ais_mutual
+from accounts.follow_graph import is_mutual as _is_mutual
+from config.write_behind import ToggleQueue
+from . import timeline, trending
+from .cache import invalidate_article
+from .models import Article
+
+Like = Article.likes.through
+
+# 쌍을 이만큼씩 묶어 OR 조건 하나로 지운다
+DELETE_CHUNK = 500
+
+
+def _delete_pairs(model, fields, pairs):
+    for i in range(0, len(pairs), DELETE_CHUNK):
+        chunk = pairs[i : i + DELETE_CHUNK]
+        model.objects.filter(
+            reduce(or_, (Q(**dict(zip(fields, pair))) for pair in chunk))
+        ).delete()
+
+
+# 좋아요 토글 (게시글 pk, 유저 pk)
+def apply_likes(adds, removes):
+    Like.objects.bulk_create(
+        [Like(article_id=article, user_id=user) for article, user in adds],
+        ignore_conflicts=True,
+    )
+    _delete_pairs(Like, ("article", "user"), removes)
+    # 이미 반영된 상태였던 쌍이 섞일 수 있으므로 증감 대신 재계산
+    changed = {article for article, _ in adds} | {article for article, _ in removes}
+    Article.objects.filter(pk__in=changed).recount()
+    for pk in changed:
+        invalidate_article(pk)
+    # 인기 점수는 게시글별 순증감을 같은 증감끼리 모아서 더한다
+    deltas = Counter(article for article, _ in adds)
+    deltas.subtract(article for article, _ in removes)
+    articles = Article.objects.only("topic").in_bulk(
+        [pk for pk, delta in deltas.items() if delta]
+    )
+    by_delta = defaultdict(list)
+    for pk, article in articles.items():
+        by_delta[deltas[pk]].append(article)
+    for delta, group in by_delta.items():
+        trending.bump_many(group, settings.TRENDING_LIKE_WEIGHT * delta)
+
+
+# 팔로우 토글 (팔로우하는 유저 pk, 팔로우 대상 pk)
+def apply_follows(adds, removes):
+    Follow.objects.bulk_create(
+        [Follow(from_user_id=user, to_user_id=target) for user, target in adds],
+        ignore_conflicts=True,
+    )
+    _delete_pairs(Follow, ("from_user", "to_user"), removes)
+    for user, target in adds:
+        timeline.backfill(user, target)
+    for user, target in removes:
+        timeline.prune(user, target)
+
+
+likes = ToggleQueue(
+    "likes",
+    apply_likes,
+    interval=settings.WRITE_BEHIND_INTERVAL,
+    batch=settings.WRITE_BEHIND_BATCH,
+)
+follow_toggles = ToggleQueue(
+    "follows",
+    apply_follows,
+    interval=settings.WRITE_BEHIND_INTERVAL,
+    batch=settings.WRITE_BEHIND_BATCH,
+)
+
+
+def toggle_like(article_pk, user_pk):
+    # 좋아요 상태면 취소 예약하고 False, 아니면 좋아요 예약하고 True
+    liked = likes.toggle(
+        (article_pk, user_pk),
+        Like.objects.filter(article=article_pk, user=user_pk).exists,
+    )
+    # 대기 중인 증감을 반영한 응답이 보이도록 상세 / 목록 버전을 바로 올린다
+    invalidate_article(article_pk)
+    return liked
+
+
+def set_like(article_pk, user_pk, liked):
+    # 좋아요 상태를 liked 로 예약하고 바뀌었는지 돌려준다
+    changed = likes.set(
+        (article_pk, user_pk),
+        liked,
+        Like.objects.filter(article=article_pk, user=user_pk).exists,
+    )
+    if changed:
+        invalidate_article(article_pk)
+    return changed
+
+
+def set_likes(user_pk, like_pks, unlike_pks):
+    # 여러 게시글의 좋아요 상태를 한 번에 예약한다
+    # 대기 중인 토글이 없는 게시글의 DB 상태는 한 쿼리로 읽는다
+    liked = set(
+        Like.objects.filter(
+            user=user_pk, article__in=like_pks + unlike_pks
+        ).values_list("article", flat=True)
+    )
+    for state, pks in [(True, like_pks), (False, unlike_pks)]:
+        for pk in pks:
+            if likes.set((pk, user_pk), state, lambda pk=pk: pk in liked):
+                invalidate_article(pk)
+
+
+def toggle_follow(user_pk, target_pk):
+    return follow_toggles.toggle(
+        (user_pk, target_pk), lambda: follows(user_pk, target_pk)
+    )
+
+
+def set_follow(user_pk, target_pk, followed):
+    return follow_toggles.set(
+        (user_pk, target_pk), followed, lambda: follows(user_pk, target_pk)
+    )
+
+
+def merge_likes(rows, key="pk"):
+    # 게시글 응답의 likes_count 에 아직 반영되지 않은 좋아요 증감을 더한다
+    if not settings.WRITE_BEHIND:
+        return rows
+    merged = []
+    for row in rows:
+        delta = likes.delta(row[key])
+        merged.append(
+            {**row, "likes_count": row["likes_count"] + delta} if delta else row
+        )
+    return merged
+
+
+def is_mutual(user_pk, target_pk):
+    # 대기 중인 팔로우 토글을 반영한 맞팔로우 여부
+    forward = follow_toggles.state((user_pk, target_pk))
+    backward = follow_toggles.state((target_pk, user_pk))
+    if forward is None and backward is None:
+        return _is_mutual(user_pk, target_pk)
+    if forward is False or backward is False:
+        return False
+    if forward is None:
+        forward = follows(user_pk, target_pk)
+    if backward is None:
+        backward = follows(target_pk, user_pk)
+    return forward and backward
+
+
+async def ais_mutual(user_pk, target_pk):
+    if (
+        follow_toggles.state((user_pk, target_pk)) is None
+        and follow_toggles.state((target_pk, user_pk)) is None
+    ):
+        return await _ais_mutual(user_pk, target_pk)
+    return await sync_to_async(is_mutual)(user_pk, target_pk)
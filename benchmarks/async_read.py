@@ -0,0 +1,185 @@
+"""동기 APIView 와 async 뷰의 ASGI 동시 요청 처리량 비교.
+
+uvicorn 처럼 config.asgi.application 에 ASGI 요청을 --concurrency 개씩 동시에 넣어
+게시글 상세 / 팔로우 조회의 동기 경로와 async 경로 (.../async/) 를 번갈아 측정한다.
+상세 응답 캐시는 기본으로 끄고 (--cached 로 켠다) 매 요청이 DB 까지 가게 한다.
+
+Django 4.2 의 async ORM 은 sync_to_async 로 요청마다 한 스레드에서 쿼리를 차례로
+실행하고 SQLite 는 연결 하나에서 쿼리를 동시에 실행하지 못하므로, 한 요청 안의
+asyncio.gather 는 쿼리 시간을 겹치지 못한다. 차이는 주로 요청당 스레드 전환 수에서 난다.
+
+    python -m benchmarks.async_read --scale small --requests 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import re
+import statistics
+import tempfile
+import time
+
+from benchmarks.data import add_scale_arguments, scale_options
+from benchmarks.hot_paths import percentile, print_results, seed, setup_django
+
+SCENARIOS = ("article_detail", "follow_check")
+SERVER_TIMING_QUERIES = re.compile(rb'desc="(\d+) queries"')
+
+
+async def asgi_get(application, path, token=None):
+    # ASGI 서버가 하는 것처럼 scope 를 만들어 요청 하나를 보내고
+    # 상태 코드와 쿼리 수 (Server-Timing 헤더) 를 돌려준다
+    headers = [(b"host", b"localhost")]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    received = asyncio.Event()
+    status = queries = None
+
+    async def receive():
+        if received.is_set():
+            # 요청 본문은 한 번만 보내고 이후에는 연결이 끊기지 않은 것처럼 기다린다
+            await asyncio.Future()
+        received.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, queries
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for name, value in message["headers"]:
+                if name.lower() == b"server-timing":
+                    queries = int(SERVER_TIMING_QUERIES.search(value).group(1))
+
+    await application(scope, receive, send)
+    return status, queries
+
+
+class Runner:
+    def __init__(self, seed_value, logins):
+        from django.contrib.auth import get_user_model
+
+        from accounts.serializers import ClaimsTokenObtainPairSerializer
+        from articles.models import Article
+        from config.asgi import application
+
+        # get_asgi_application() 이 django.setup() 으로 로깅을 다시 설정하므로 다시 끈다
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        self.application = application
+        self.rng = random.Random(seed_value)
+        self.articles = list(Article.objects.values_list("pk", "author_id"))
+        users = list(get_user_model().objects.order_by("pk")[:logins])
+        self.tokens = {
+            user.pk: str(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+            for user in users
+        }
+        self.user_pks = list(self.tokens)
+
+    def paths(self, scenario, requests):
+        # 동기 / async 경로가 같은 요청 순서를 받도록 (경로, 토큰) 을 미리 만든다
+        paths = []
+        for _ in range(requests):
+            if scenario == "article_detail":
+                pk, author = self.rng.choice(self.articles)
+                paths.append((f"/articles/{author}/{pk}/", None))
+            elif scenario == "follow_check":
+                user = self.rng.choice(self.user_pks)
+                target = (
+                    user if self.rng.random() < 0.5 else self.rng.choice(self.user_pks)
+                )
+                paths.append((f"/accounts/{target}/follow/", self.tokens[user]))
+            else:
+                raise ValueError(scenario)
+        return paths
+
+    async def run_paths(self, paths, concurrency):
+        latencies, queries, statuses = [], [], {}
+        pending = iter(paths)
+
+        async def worker():
+            for path, token in pending:
+                began = time.perf_counter()
+                status, count = await asgi_get(self.application, path, token)
+                latencies.append((time.perf_counter() - began) * 1000)
+                queries.append(count)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        return {
+            "requests": len(paths),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+            "queries_mean": round(statistics.fmean(queries), 2),
+            "queries_max": max(queries),
+            "throughput_rps": round(len(paths) / elapsed, 1),
+            "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        }
+
+    def run(self, scenario, requests, warmup, concurrency):
+        sync_paths = self.paths(scenario, requests + warmup)
+        async_paths = [(path + "async/", token) for path, token in sync_paths]
+        results = {}
+        for name, paths in [("sync", sync_paths), ("async", async_paths)]:
+            asyncio.run(self.run_paths(paths[:warmup], concurrency))
+            results[f"{scenario}:{name}"] = asyncio.run(
+                self.run_paths(paths[warmup:], concurrency)
+            )
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_scale_arguments(parser)
+    parser.add_argument("--requests", type=int, default=500, help="경로당 요청 수")
+    parser.add_argument("--warmup", type=int, default=50, help="경로당 워밍업 요청 수")
+    parser.add_argument("--concurrency", type=int, default=50, help="동시 요청 수")
+    parser.add_argument("--logins", type=int, default=20, help="요청에 쓸 로그인 유저 수")
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append")
+    parser.add_argument("--cached", action="store_true", help="게시글 상세 캐시 사용")
+    args = parser.parse_args()
+
+    fd, database = tempfile.mkstemp(suffix=".sqlite3")
+    os.close(fd)
+    setup_django(database)
+    from django.test.utils import override_settings
+
+    caches = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    try:
+        created, seed_seconds = seed(scale_options(args), args.seed)
+        print(f"시드 데이터 {created} ({seed_seconds:.1f}초)")
+        runner = Runner(args.seed, args.logins)
+        results = {}
+        overrides = {"SERVER_TIMING": True}
+        if not args.cached:
+            overrides["CACHES"] = caches
+        with override_settings(**overrides):
+            for scenario in args.scenario or SCENARIOS:
+                results.update(
+                    runner.run(scenario, args.requests, args.warmup, args.concurrency)
+                )
+    finally:
+        os.remove(database)
+    print(f"동시 요청 {args.concurrency}개")
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""시드 고정 합성 데이터 생성기.
+
+유저 / 팔로우 / 게시글 / 댓글 / 좋아요를 import_forum 과 같은 JSONL 레코드로 만든다.
+같은 --seed 와 규모면 항상 같은 데이터가 나온다.
+
+    python -m benchmarks.data --scale small --seed 1 > forum.jsonl
+    python manage.py import_forum forum.jsonl
+"""
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+
+# 유저, 게시글, 유저당 팔로우, 게시글당 댓글, 게시글당 좋아요 (평균)
+SCALES = {
+    "small": {"users": 200, "articles": 2000, "follows": 10, "comments": 3, "likes": 5},
+    "medium": {
+        "users": 5000,
+        "articles": 50000,
+        "follows": 30,
+        "comments": 5,
+        "likes": 10,
+    },
+    "large": {
+        "users": 50000,
+        "articles": 500000,
+        "follows": 50,
+        "comments": 5,
+        "likes": 20,
+    },
+}
+TOPICS = ("game", "movie", "book", "music", "picture")
+WORDS = (
+    "오늘",
+    "게임",
+    "영화",
+    "책",
+    "음악",
+    "그림",
+    "리뷰",
+    "추천",
+    "후기",
+    "질문",
+    "정말",
+    "재미",
+    "감동",
+    "최고",
+    "별로",
+    "다시",
+    "처음",
+    "마지막",
+    "이번",
+    "다음",
+    "django",
+    "python",
+    "review",
+    "best",
+    "new",
+    "play",
+    "watch",
+    "read",
+)
+PASSWORD = "password"
+START = datetime(2023, 1, 1)
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _author(rng, users):
+    # 소수의 유저가 글 / 팔로워를 많이 갖도록 치우친 분포
+    return min(int(rng.paretovariate(1.2)), users)
+
+
+def generate(users, articles, follows, comments, likes, seed=0):
+    from django.contrib.auth.hashers import make_password
+
+    from articles.hashers import COMMENT_HASHER
+
+    rng = random.Random(seed)
+    # 해시는 시드로 정한 salt 로 한 번만 만들어 모든 유저 / 익명 댓글에 재사용
+    salt = f"benchmark{seed}"
+    password_hash = make_password(PASSWORD, salt)
+    comment_hash = make_password(PASSWORD, salt, hasher=COMMENT_HASHER)
+
+    for pk in range(1, users + 1):
+        yield {
+            "type": "user",
+            "id": pk,
+            "username": f"user{pk}",
+            "email": f"user{pk}@example.com",
+            "nickname": f"user{pk}",
+            "fullname": f"User {pk}",
+            "password_hash": password_hash,
+            "join_date": (START + timedelta(minutes=pk)).isoformat(),
+        }
+    for follower in range(1, users + 1):
+        targets = {_author(rng, users) for _ in range(rng.randint(0, 2 * follows))}
+        for followee in sorted(targets - {follower}):
+            yield {"type": "follow", "follower": follower, "followee": followee}
+    comment_pk = 0
+    for pk in range(1, articles + 1):
+        created = START + timedelta(minutes=pk * 3)
+        yield {
+            "type": "article",
+            "id": pk,
+            "author": _author(rng, users),
+            "title": _text(rng, rng.randint(2, 6)),
+            "content": _text(rng, rng.randint(20, 200)),
+            "topic": rng.choice(TOPICS),
+            "created_at": created.isoformat(),
+            "updated_at": (
+                created + timedelta(minutes=rng.randint(0, 600))
+            ).isoformat(),
+        }
+        for i in range(rng.randint(0, 2 * comments)):
+            comment_pk += 1
+            anonymous = rng.random() < 0.3
+            yield {
+                "type": "comment",
+                "id": comment_pk,
+                "article": pk,
+                "author": None if anonymous else rng.randint(1, users),
+                "content": _text(rng, rng.randint(3, 30)),
+                "password_hash": comment_hash if anonymous else None,
+                "created_at": (created + timedelta(minutes=i + 1)).isoformat(),
+            }
+        likers = {rng.randint(1, users) for _ in range(rng.randint(0, 2 * likes))}
+        for user in sorted(likers):
+            yield {"type": "like", "user": user, "article": pk}
+
+
+def add_scale_arguments(parser):
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"{name} 규모 직접 지정")
+
+
+def scale_options(args):
+    options = dict(SCALES[args.scale])
+    for name in options:
+        if getattr(args, name) is not None:
+            options[name] = getattr(args, name)
+    return options
+
+
+def main():
+    import os
+
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+
+    parser = argparse.ArgumentParser()
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+    for record in generate(seed=args.seed, **scale_options(args)):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
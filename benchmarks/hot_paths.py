@@ -0,0 +1,250 @@
+"""API 주요 경로 부하 측정.
+
+임시 SQLite DB 를 만들어 benchmarks.data 로 시드 고정 데이터를 넣고
+게시글 목록 / 상세, 좋아요 토글, 팔로우 조회, 댓글 작성 요청을 순서대로 보내
+지연 시간 p50 / p95 / p99, 요청당 쿼리 수, 처리량을 JSON 으로 남긴다.
+
+    python -m benchmarks.hot_paths --scale small --seed 1 --requests 300 --output run.json
+    python -m benchmarks.hot_paths --scale small --seed 1 --compare run.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.data import add_scale_arguments, generate, scale_options, PASSWORD
+
+SCENARIOS = (
+    "article_list",
+    "article_detail",
+    "like_toggle",
+    "follow_check",
+    "comment_create",
+)
+
+
+def setup_django(database):
+    # settings 를 읽기 전에 DB 경로를 정해야 한다
+    os.environ["DATABASE_NAME"] = database
+    os.environ.pop("DATABASE_REPLICAS", None)
+    # 요청마다 남는 계측 로그는 측정에 방해가 되므로 예산 초과만 남긴다
+    os.environ.setdefault("INSTRUMENTATION_LOG_LEVEL", "WARNING")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import logging
+
+    import django
+
+    django.setup()
+    # 팔로우 조회의 403 같은 4xx 경고도 측정 중에는 남기지 않는다
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+
+
+def seed(options, seed_value, chunk_size=5000):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    from articles.importer import ForumImporter, source_timestamps
+    from articles.models import Article, Comment
+
+    call_command("migrate", verbosity=0)
+    importer = ForumImporter()
+    started = time.perf_counter()
+    records = []
+    with source_timestamps(get_user_model(), Article, Comment):
+        for lineno, record in enumerate(generate(seed=seed_value, **options), 1):
+            records.append((lineno, record))
+            if len(records) >= chunk_size:
+                importer.import_chunk(records)
+                records = []
+        if records:
+            importer.import_chunk(records)
+    importer.finish()
+    return dict(importer.created), time.perf_counter() - started
+
+
+def percentile(values, p):
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))
+    return values[index]
+
+
+class Runner:
+    def __init__(self, seed_value, logins):
+        from django.contrib.auth import get_user_model
+        from rest_framework.test import APIClient
+
+        from articles.models import Article
+        from config.throttling import SlidingWindowRateThrottle
+
+        # 제한 검사 비용은 측정하되 적은 유저로 많은 요청을 보내도 429 가 나지 않게 한다
+        SlidingWindowRateThrottle.THROTTLE_RATES = {
+            scope: "1000000/min" for scope in SlidingWindowRateThrottle.THROTTLE_RATES
+        }
+        self.rng = random.Random(seed_value)
+        self.client = APIClient(SERVER_NAME="localhost")
+        self.articles = list(Article.objects.values_list("pk", "author_id"))
+        users = list(get_user_model().objects.order_by("pk")[:logins])
+        self.tokens = {}
+        for user in users:
+            response = self.client.post(
+                "/accounts/api/token/",
+                {"username": user.username, "password": PASSWORD},
+            )
+            self.tokens[user.pk] = response.data["access"]
+        self.user_pks = list(self.tokens)
+
+    def _article(self):
+        # 앞쪽 게시글에 요청이 몰리는 분포 (상세 캐시 적중률이 현실적으로 나오도록)
+        index = min(int(self.rng.paretovariate(1.1)) - 1, len(self.articles) - 1)
+        return self.articles[-1 - index]
+
+    def _login(self, exclude=None):
+        user = self.rng.choice([pk for pk in self.user_pks if pk != exclude])
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens[user]}")
+        return user
+
+    def request(self, scenario):
+        self.client.credentials()
+        if scenario == "article_list":
+            topic = self.rng.choice(["all", "game", "movie", "book"])
+            ordering = self.rng.choice(["recent", "likes", "comments"])
+            return self.client.get(f"/articles/?topic={topic}&ordering={ordering}")
+        if scenario == "article_detail":
+            pk, author = self._article()
+            return self.client.get(f"/articles/{author}/{pk}/")
+        if scenario == "like_toggle":
+            pk, author = self._article()
+            self._login(exclude=author)
+            return self.client.post(f"/articles/{author}/{pk}/likes/")
+        if scenario == "follow_check":
+            user = self._login()
+            # 절반은 자기 자신 (항상 허용), 절반은 임의의 유저 (맞팔로우가 아니면 403)
+            target = user if self.rng.random() < 0.5 else self.rng.choice(self.user_pks)
+            return self.client.get(f"/accounts/{target}/follow/")
+        if scenario == "comment_create":
+            pk, author = self._article()
+            self._login()
+            return self.client.post(
+                f"/articles/{author}/{pk}/", {"content": "벤치마크 댓글"}, format="json"
+            )
+        raise ValueError(scenario)
+
+    def run(self, scenario, requests, warmup):
+        for _ in range(warmup):
+            self.request(scenario)
+        latencies, queries, statuses = [], [], {}
+        started = time.perf_counter()
+        for _ in range(requests):
+            began = time.perf_counter()
+            response = self.request(scenario)
+            latencies.append((time.perf_counter() - began) * 1000)
+            queries.append(response.timings["queries"])
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        elapsed = time.perf_counter() - started
+        return {
+            "requests": requests,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+            "queries_mean": round(statistics.fmean(queries), 2),
+            "queries_max": max(queries),
+            "throughput_rps": round(requests / elapsed, 1),
+            "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    header = f"{'scenario':<16}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}{'rps':>9}"
+    print(header)
+    for scenario, row in results.items():
+        line = (
+            f"{scenario:<16}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+            f"{row['p99_ms']:>9.2f}{row['queries_mean']:>9.2f}{row['throughput_rps']:>9.1f}"
+        )
+        if baseline and scenario in baseline:
+            before = baseline[scenario]
+            line += (
+                f"   p50 {row['p50_ms'] / before['p50_ms']:.2f}x,"
+                f" p95 {row['p95_ms'] / before['p95_ms']:.2f}x,"
+                f" queries {row['queries_mean'] - before['queries_mean']:+.2f}"
+            )
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_scale_arguments(parser)
+    parser.add_argument("--requests", type=int, default=300, help="시나리오당 요청 수")
+    parser.add_argument("--warmup", type=int, default=20, help="시나리오당 워밍업 요청 수")
+    parser.add_argument("--logins", type=int, default=20, help="요청에 쓸 로그인 유저 수")
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append")
+    parser.add_argument("--database", help="SQLite 파일 (기본: 임시 파일, 끝나면 삭제)")
+    parser.add_argument("--output", help="결과 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    options = scale_options(args)
+    database = args.database
+    if not database:
+        fd, database = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+    setup_django(database)
+    try:
+        created, seed_seconds = seed(options, args.seed)
+        print(f"시드 데이터 {created} ({seed_seconds:.1f}초)")
+        runner = Runner(args.seed, args.logins)
+        results = {
+            scenario: runner.run(scenario, args.requests, args.warmup)
+            for scenario in args.scenario or SCENARIOS
+        }
+    finally:
+        if not args.database and os.path.exists(database):
+            os.remove(database)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+
+    if args.output:
+        import django
+
+        report = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "seed": args.seed,
+                "scale": options,
+                "requests": args.requests,
+                "warmup": args.warmup,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""FastJSONRenderer / FastJSONParser 와 DRF 기본 JSON 렌더러 / 파서 비교.
+
+    python -m benchmarks.json_render --rows 10000 --repeat 20
+"""
+import argparse
+import os
+import timeit
+from io import BytesIO
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from config.parsers import FastJSONParser  # noqa: E402
+from config.renderers import FastJSONRenderer  # noqa: E402
+
+
+def article_rows(rows):
+    # ArticleListSerializer 출력과 같은 모양의 목록
+    return {
+        "next": "http://testserver/articles/?cursor=eyJwIjpbXSwiciI6MH0",
+        "previous": None,
+        "results": [
+            {
+                "pk": i,
+                "author": {"pk": i % 97, "nickname": f"닉네임{i % 97}"},
+                "title": f"게시글 제목 {i}",
+                "topic": ("game", "movie", "book")[i % 3],
+                "likes_count": i % 13,
+                "comments_count": i % 7,
+                "created_at": "2023-09-01T12:30:15.123456",
+                "updated_at": "2023-09-02T08:00:00",
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+def measure(label, func, repeat):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<24} {best * 1000:8.2f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    data = article_rows(args.rows)
+    body = JSONRenderer().render(data)
+    assert FastJSONRenderer().render(data) == body
+    print(f"{args.rows} rows, {len(body) / 1024:.0f} KiB")
+
+    base = measure("JSONRenderer", lambda: JSONRenderer().render(data), args.repeat)
+    fast = measure(
+        "FastJSONRenderer", lambda: FastJSONRenderer().render(data), args.repeat
+    )
+    print(f"{'render speedup':<24} {base / fast:8.1f}x")
+
+    base = measure("JSONParser", lambda: JSONParser().parse(BytesIO(body)), args.repeat)
+    fast = measure(
+        "FastJSONParser", lambda: FastJSONParser().parse(BytesIO(body)), args.repeat
+    )
+    print(f"{'parse speedup':<24} {base / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
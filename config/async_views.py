@@ -0,0 +1,95 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.permissions import AllowAny
+from rest_framework.settings import api_settings
+
+from .renderers import FastJSONRenderer
+from .routers import ais_pinned, replica_reads
+
+
+async def alist(queryset):
+    return [obj async for obj in queryset]
+
+
+class AsyncAPIView(View):
+    # async 핸들러(async def get ...)를 쓰는 조회 전용 뷰
+    # 핸들러는 self.render(data) 로 만든 응답을 돌려준다
+    # DRF APIView 는 동기 뷰라 ASGI 에서 요청마다 스레드로 넘어가므로
+    # 인증 / 권한 / 예외 처리 / JSON 렌더링만 APIView 와 같게 맞춰 직접 처리한다
+    # 인증 클래스는 DB 를 읽지 않아야 한다 (StatelessJWTAuthentication)
+    # 캐시는 공유 백엔드 (Redis 등) 일 수 있으므로 핸들러에서도 async API (cache.aget 등) 를 쓴다
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = [AllowAny]
+    # 이 메서드의 조회는 replica 로 보낸다 (ReplicaReadMixin 과 같음)
+    replica_methods = ()
+    renderer_class = FastJSONRenderer
+
+    async def dispatch(self, request, *args, **kwargs):
+        # KeysetPagination 등 DRF Request 를 받는 헬퍼를 그대로 쓰기 위해
+        request.query_params = request.GET
+        try:
+            # 쓰기 메서드의 인증은 User 를 동기로 읽으므로 (StatelessJWTAuthentication)
+            # 없는 메서드는 인증 전에 거절한다
+            handler = getattr(self, request.method.lower(), None)
+            if request.method.lower() not in self.http_method_names or not handler:
+                raise exceptions.MethodNotAllowed(request.method)
+            self.authenticate(request)
+            self.check_permissions(request)
+            user = request.user
+            if request.method in self.replica_methods and not (
+                user.is_authenticated and await ais_pinned(user.pk)
+            ):
+                with replica_reads():
+                    return await handler(request, *args, **kwargs)
+            return await handler(request, *args, **kwargs)
+        except (Http404, ObjectDoesNotExist):
+            return self.handle_exception(request, exceptions.NotFound())
+        except exceptions.APIException as exc:
+            return self.handle_exception(request, exc)
+
+    def authenticate(self, request):
+        request.user = AnonymousUser()
+        for authentication_class in self.authentication_classes:
+            user_auth = authentication_class().authenticate(request)
+            if user_auth is not None:
+                request.user, request.auth = user_auth
+                return
+
+    def check_permissions(self, request):
+        for permission_class in self.permission_classes:
+            permission = permission_class()
+            if not permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def handle_exception(self, request, exc):
+        # rest_framework.views.exception_handler 와 같은 응답 모양
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+        response = self.render(data, exc.status_code)
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            header = self.authenticate_header(request)
+            if header:
+                response["WWW-Authenticate"] = header
+            else:
+                response.status_code = status.HTTP_403_FORBIDDEN
+        return response
+
+    def authenticate_header(self, request):
+        if self.authentication_classes:
+            return self.authentication_classes[0]().authenticate_header(request)
+
+    def render(self, data, code=status.HTTP_200_OK):
+        return HttpResponse(
+            self.renderer_class().render(data),
+            content_type=self.renderer_class.media_type,
+            status=code,
+        )
@@ -0,0 +1,25 @@
+from django.db import connections, router
+from django.db.models.constants import OnConflict
+
+
+def insert_ignore(model, **values):
+    # 한 행을 INSERT ... ON CONFLICT DO NOTHING (SQLite 는 INSERT OR IGNORE) 로 넣고
+    # 넣은 행 수 (0 / 1) 를 돌려준다
+    # 유니크 제약에 걸리면 예외 없이 0 이라 같은 행을 동시에 넣어도 한 요청만 1 을 받는다
+    fields = [model._meta.get_field(name) for name in values]
+    connection = connections[router.db_for_write(model)]
+    ops = connection.ops
+    sql = "%s %s (%s) VALUES (%s) %s" % (
+        ops.insert_statement(on_conflict=OnConflict.IGNORE),
+        ops.quote_name(model._meta.db_table),
+        ", ".join(ops.quote_name(field.column) for field in fields),
+        ", ".join(["%s"] * len(fields)),
+        ops.on_conflict_suffix_sql(fields, OnConflict.IGNORE, None, None),
+    )
+    params = [
+        field.get_db_prep_save(value, connection)
+        for field, value in zip(fields, values.values())
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql.rstrip(), params)
+        return cursor.rowcount
@@ -0,0 +1,124 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("config.instrumentation")
+
+
+class QueryRecorder:
+    # connection.execute_wrapper 로 모든 DB 연결의 쿼리 수 / 시간을 모은다
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements.append(sql)
+
+
+def _view_class(request):
+    match = getattr(request, "resolver_match", None)
+    return getattr(match.func, "view_class", None) if match else None
+
+
+def query_budget(view_class, method):
+    # APIView 의 query_budget = {"GET": 2, ...} 에서 메서드의 허용 쿼리 수
+    budgets = getattr(view_class, "query_budget", None) or {}
+    return budgets.get(method)
+
+
+class InstrumentationMiddleware:
+    # 요청마다 SQL 수 / SQL 시간 / 뷰 시간 / 렌더링(직렬화) 시간 / 전체 시간을 재서
+    # 구조화된 로그 한 줄로 남기고, SERVER_TIMING 이면 Server-Timing 헤더로도 내보낸다
+    # async 뷰 앞에서 스레드로 넘어가지 않도록 sync / async 양쪽을 지원한다
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def process_template_response(self, request, response):
+        # DRF Response 는 이 다음에 렌더링된다
+        request._view_finished = time.perf_counter()
+        return response
+
+    def _install(self, stack, recorder):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            self._install(stack, recorder)
+            response = self.get_response(request)
+        return self.record(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        # DB 연결은 스레드마다 따로라서 async ORM 이 쿼리를 실행하는 스레드에서 감싼다
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        stack = ExitStack()
+        await sync_to_async(self._install)(stack, recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.record(request, response, recorder, started)
+
+    def record(self, request, response, recorder, started):
+        finished = time.perf_counter()
+        view_finished = getattr(request, "_view_finished", finished)
+
+        timings = {
+            "queries": recorder.count,
+            "db": recorder.duration * 1000,
+            "view": (view_finished - started - recorder.duration) * 1000,
+            "render": (finished - view_finished) * 1000,
+            "total": (finished - started) * 1000,
+        }
+        response.timings = timings
+        response.statements = recorder.statements
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = ", ".join(
+                [f'db;dur={timings["db"]:.2f};desc="{recorder.count} queries"']
+                + [
+                    f"{name};dur={timings[name]:.2f}"
+                    for name in ("view", "render", "total")
+                ]
+            )
+
+        view_class = _view_class(request)
+        budget = query_budget(view_class, request.method)
+        over_budget = budget is not None and recorder.count > budget
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "endpoint": view_class.__name__ if view_class else None,
+                    "status": response.status_code,
+                    **{name: round(value, 2) for name, value in timings.items()},
+                    "query_budget": budget,
+                    "over_budget": over_budget,
+                },
+                ensure_ascii=False,
+            ),
+        )
+        return response
@@ -0,0 +1,27 @@
+import codecs
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import DIGITS, FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    # UTF-8 요청 본문은 orjson 으로 파싱하고
+    # orjson 이 거부하는 입력(NaN, 잘못된 JSON 등)은 기본 JSONParser 에 맡겨 결과 / 에러를 맞춘다
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        # orjson 은 64비트를 넘는 정수를 float 로 읽으므로 긴 숫자가 있으면 기본 파서를 쓴다
+        if b"0" * 20 in body.translate(DIGITS):
+            return super().parse(BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(BytesIO(body), media_type, parser_context)
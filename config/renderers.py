@@ -0,0 +1,57 @@
+import math
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 숫자를 모두 0 으로 바꿔 정규식 없이 bytes 검색만으로 숫자 패턴을 찾는다
+DIGITS = bytes.maketrans(b"123456789", b"000000000")
+
+
+def float_mismatch(ret):
+    # orjson 과 json.dumps 의 float 표기가 갈리는 경우 (지수 표기, 1e-4 미만의 소수)
+    return b"0.0000" in ret or b"0e" in ret.translate(DIGITS)
+
+
+def has_nonfinite(data):
+    # orjson 은 NaN / inf 를 null 로 쓰지만 json.dumps 는 NaN 으로 쓰거나 (STRICT_JSON 이면) 예외를 낸다
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(has_nonfinite(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(has_nonfinite(value) for value in data)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    # orjson 이 있으면 orjson 으로, 없으면 기본 JSONRenderer 로 렌더링
+    # 들여쓰기 / ensure_ascii 가 필요하거나 orjson 이 처리 못 하는 값(큰 정수, 문자열이 아닌 키 등),
+    # float 표기가 달라질 수 있는 출력은 기본 렌더러로 다시 렌더링해 결과를 바이트 단위로 맞춘다
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # null 이 없으면 NaN / inf 도 없으므로 그때만 원본 데이터를 훑는다
+        if float_mismatch(ret) or (b"null" in ret and has_nonfinite(data)):
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
@@ -0,0 +1,87 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+
+# 현재 요청(컨텍스트)의 조회를 replica 로 보낼지 여부
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def _pin_key(user_pk):
+    return f"db:pin:{user_pk}"
+
+
+def pin_primary(user_pk):
+    # 쓰기 직후 REPLICA_LAG 동안은 이 유저의 조회를 primary 로 보내 자기 쓰기를 바로 읽게 한다
+    cache.set(_pin_key(user_pk), True, settings.REPLICA_LAG)
+
+
+def is_pinned(user_pk):
+    return cache.get(_pin_key(user_pk), False)
+
+
+async def ais_pinned(user_pk):
+    return await cache.aget(_pin_key(user_pk), False)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _replica_reads.set(enabled and bool(settings.REPLICA_DATABASES))
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    # replica_reads() 안의 조회만 replica 로, 나머지와 모든 쓰기는 primary 로 보낸다
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            return random.choice(settings.REPLICA_DATABASES)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+class ReplicaReadMixin:
+    # replica_methods 요청의 조회를 replica 로 보낸다
+    # 요청 유저가 최근에 쓰기를 했으면 (pin_primary) primary 에서 읽는다
+    replica_methods = ("GET",)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        user = request.user
+        if request.method in self.replica_methods and not (
+            user.is_authenticated and is_pinned(user.pk)
+        ):
+            self._replica_reads = replica_reads()
+            self._replica_reads.__enter__()
+
+    def dispatch(self, request, *args, **kwargs):
+        self._replica_reads = None
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._replica_reads is not None:
+                self._replica_reads.__exit__(None, None, None)
+
+
+class ReadYourWritesMiddleware(MiddlewareMixin):
+    # 로그인 유저의 쓰기 요청이 성공하면 그 유저를 잠시 primary 에 고정
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                pin_primary(user.pk)
+        return response
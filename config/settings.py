@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 
@@ -48,6 +50,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "config.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -56,6 +59,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "config.routers.ReadYourWritesMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -82,17 +86,112 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
+# 환경 변수로 설정 (기본은 로컬 SQLite 파일 하나)
+# DATABASE_ENGINE / NAME / USER / PASSWORD / HOST / PORT: primary
+# DATABASE_REPLICAS: 쉼표로 구분한 replica 호스트 (SQLite 면 파일 경로)
+# DATABASE_CONN_MAX_AGE: 연결 유지 시간 (초, 0 이면 요청마다 새 연결)
+# DATABASE_POOLER=transaction: PgBouncer 등 트랜잭션 단위 풀러 뒤에서 서버 사이드 커서 끄기
+DATABASE_ENGINE = os.environ.get("DATABASE_ENGINE", "django.db.backends.sqlite3")
+PRIMARY_DATABASE = {
+    "ENGINE": DATABASE_ENGINE,
+    "NAME": os.environ.get("DATABASE_NAME", BASE_DIR / "db.sqlite3"),
+    "USER": os.environ.get("DATABASE_USER", ""),
+    "PASSWORD": os.environ.get("DATABASE_PASSWORD", ""),
+    "HOST": os.environ.get("DATABASE_HOST", ""),
+    "PORT": os.environ.get("DATABASE_PORT", ""),
+    "CONN_MAX_AGE": int(os.environ.get("DATABASE_CONN_MAX_AGE", 60)),
+    "CONN_HEALTH_CHECKS": True,
+    "DISABLE_SERVER_SIDE_CURSORS": os.environ.get("DATABASE_POOLER") == "transaction",
+}
+DATABASES = {"default": PRIMARY_DATABASE}
+for i, replica in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICAS", "").split(","))
+):
+    location = {"NAME": replica} if "sqlite" in DATABASE_ENGINE else {"HOST": replica}
+    DATABASES[f"replica{i + 1}"] = {
+        **PRIMARY_DATABASE,
+        **location,
+        # 테스트에서는 primary 테스트 DB 를 그대로 본다
+        "TEST": {"MIRROR": "default"},
+    }
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["config.routers.ReplicaRouter"]
+
+# 쓰기 후 그 유저의 조회를 primary 로 고정할 시간 (초, replica 복제 지연보다 길게)
+REPLICA_LAG = int(os.environ.get("DATABASE_REPLICA_LAG", 5))
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
 
+# 게시글 상세 응답 캐시 유지 시간 (초)
+ARTICLE_CACHE_TIMEOUT = 60 * 10
+
+# 게시글 상세 응답에 포함할 댓글 / 좋아요 유저 수
+ARTICLE_DETAIL_COMMENTS = 20
+ARTICLE_DETAIL_LIKERS = 20
+
+# 게시글 검색 인덱스 백엔드 (articles.search.BaseSearchBackend 구현)
+# FTS5 인덱스 테이블은 SQLite 에서만 만들어지므로 (0009 마이그레이션) 다른 DB 는 기본으로 끈다
+ARTICLE_SEARCH_BACKEND = os.environ.get(
+    "ARTICLE_SEARCH_BACKEND",
+    "articles.search.SQLiteFTS5Backend"
+    if "sqlite" in DATABASE_ENGINE
+    else "articles.search.NullSearchBackend",
+)
+
+# 인기 게시글 점수 가중치 / 반감기 (시간) / 삭제 기준 점수
+TRENDING_LIKE_WEIGHT = 1.0
+TRENDING_COMMENT_WEIGHT = 2.0
+TRENDING_HALF_LIFE_HOURS = 6
+TRENDING_MIN_SCORE = 0.01
+
+# 타임라인: 팔로워가 이보다 많으면 작성 시 fan-out 대신 읽을 때 조회
+TIMELINE_FANOUT_LIMIT = 10000
+TIMELINE_CELEBRITY_TIMEOUT = 60 * 10
+TIMELINE_BATCH_SIZE = 1000
+# 팔로우 시 채워넣을 상대의 최근 글 수
+TIMELINE_BACKFILL = 50
+
+
+# 좋아요 / 팔로우 토글을 바로 쓰지 않고 모아서 반영 (articles.write_behind)
+# 백그라운드 스레드가 WRITE_BEHIND_INTERVAL 초마다, 또는 WRITE_BEHIND_BATCH 쌍이 쌓이면 반영한다
+WRITE_BEHIND = os.environ.get("WRITE_BEHIND") == "1"
+WRITE_BEHIND_INTERVAL = float(os.environ.get("WRITE_BEHIND_INTERVAL", 1.0))
+WRITE_BEHIND_BATCH = 1000
+
+
+# 응답에 Server-Timing 헤더 (SQL 수 / 시간, 뷰 / 렌더링 / 전체 시간) 포함 여부
+SERVER_TIMING = DEBUG
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        # 요청별 SQL 수 / 시간 JSON 로그
+        "config.instrumentation": {
+            "handlers": ["console"],
+            "level": os.environ.get(
+                "INSTRUMENTATION_LOG_LEVEL", "WARNING" if "test" in sys.argv else "INFO"
+            ),
+            "propagate": False,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
+# 익명 댓글 비밀번호 PBKDF2 반복 횟수 (articles.hashers 의 전용 해셔가 직접 쓴다)
+COMMENT_PASSWORD_ITERATIONS = 20000
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -110,15 +209,49 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.StatelessJWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "config.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
+    "DEFAULT_PAGINATION_CLASS": "articles.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
+    # 뷰의 throttle_scopes 에 적힌 메서드만 scope 별로 제한 (로그인 유저별, 익명은 IP 별)
+    "DEFAULT_THROTTLE_CLASSES": ("config.throttling.MethodScopedRateThrottle",),
+    "DEFAULT_THROTTLE_RATES": {
+        "article_create": "30/hour",
+        "comment_create": "10/min",
+        "like": "120/min",
+        "follow": "60/min",
+        "signup": "5/hour",
+        "comment_password": "30/min",
+    },
 }
 
 # JWT 토큰 세팅
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.FastTokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "accounts.serializers.FastTokenBlacklistSerializer",
 }
 
+# 블랙리스트 jti 블룸 필터 크기 (비트) / 해시 함수 수
+JWT_BLACKLIST_BLOOM_BITS = 1 << 23
+JWT_BLACKLIST_BLOOM_HASHES = 7
+# 다른 프로세스의 블랙리스트 추가를 캐시 세대 값 없이도 읽어오는 주기 (초)
+# 공유 캐시가 아니면 로그아웃한 refresh 토큰이 다른 프로세스에서 이 시간만큼 더 통과할 수 있다
+JWT_BLACKLIST_SYNC_INTERVAL = 5
+
+# 토큰 인증 후 실제 User 가 필요할 때 조회 결과를 캐시하는 시간 (초)
+AUTH_USER_CACHE_TIMEOUT = 5
+
 # 배포 시 허용 출처를 명시
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -0,0 +1,27 @@
+from rest_framework.test import APIClient
+
+from .instrumentation import query_budget
+
+
+class QueryBudgetAPIClient(APIClient):
+    # 모든 요청에서 뷰의 query_budget 을 넘으면 테스트를 실패시킨다
+    # (InstrumentationMiddleware 가 붙인 response.timings 사용)
+    def request(self, **kwargs):
+        response = super().request(**kwargs)
+        view_class = getattr(response.resolver_match.func, "view_class", None)
+        method = response.request["REQUEST_METHOD"]
+        budget = query_budget(view_class, method)
+        count = response.timings["queries"]
+        if budget is not None and count > budget:
+            statements = "\n".join(
+                f"  {i}. {sql}" for i, sql in enumerate(response.statements, 1)
+            )
+            raise AssertionError(
+                f"{method} {response.request['PATH_INFO']} ({view_class.__name__}): "
+                f"쿼리 {count}개 > 예산 {budget}개\n{statements}"
+            )
+        return response
+
+
+class QueryBudgetMixin:
+    client_class = QueryBudgetAPIClient
@@ -0,0 +1,84 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    # scope 의 요청 수 / 기간 (DEFAULT_THROTTLE_RATES) 을 로그인 유저별, 익명이면 IP 별로 제한
+    # SimpleRateThrottle 은 요청 시각 목록을 읽고 다시 써서 동시 요청끼리 기록을 덮어쓰므로
+    # 기간 단위 창마다 카운터를 두고 cache.incr 로 원자적으로 올린다
+    # 이전 창 카운트를 지나간 비율만큼 줄여 더하므로 (슬라이딩 창 근사)
+    # 용량 num_requests 가 기간 동안 고르게 다시 차는 토큰 버킷처럼 동작한다
+    cache_format = "throttle:%(scope)s:%(ident)s:%(window)d"
+
+    def get_cache_key(self, request, view):
+        user = request.user
+        if user and user.is_authenticated:
+            return f"user:{user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def _key(self, ident, window):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": ident,
+            "window": window,
+        }
+
+    def _incr(self, key):
+        # 이전 창 카운트를 읽을 수 있도록 두 기간 동안 남긴다
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            if self.cache.add(key, 1, self.duration * 2):
+                return 1
+            return self.cache.incr(key)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        ident = self.get_cache_key(request, view)
+        if ident is None:
+            return True
+        now = self.timer()
+        window = int(now // self.duration)
+        self.elapsed = now - window * self.duration
+        key = self._key(ident, window)
+        self.previous = self.cache.get(self._key(ident, window - 1), 0)
+        self.current = self._incr(key)
+        weight = 1 - self.elapsed / self.duration
+        if self.previous * weight + self.current <= self.num_requests:
+            return True
+        # 거절한 요청은 세지 않는다
+        try:
+            self.current = self.cache.decr(key)
+        except ValueError:
+            self.current -= 1
+        return False
+
+    def wait(self):
+        # 다음 요청이 허용될 때까지 남은 시간 (초)
+        limit, duration = self.num_requests, self.duration
+        if self.current < limit and self.previous:
+            # 이번 창 안에서 이전 창의 비중이 충분히 줄어들면 된다
+            remaining = duration * (1 - (limit - self.current - 1) / self.previous)
+            remaining -= self.elapsed
+        else:
+            # 다음 창에서 지금 창이 이전 창이 되어 줄어들어야 한다
+            remaining = duration - self.elapsed
+            remaining += duration * (1 - (limit - 1) / max(self.current, 1))
+        return max(remaining, 0)
+
+
+class MethodScopedRateThrottle(SlidingWindowRateThrottle):
+    # 뷰의 throttle_scopes = {"POST": "like", ...} 에서 요청 메서드의 scope 로 제한
+    # scope 가 없는 메서드 / 뷰는 제한하지 않는다
+    def __init__(self):
+        # rate 는 뷰와 메서드를 알아야 정해진다
+        pass
+
+    def allow_request(self, request, view):
+        scopes = getattr(view, "throttle_scopes", None) or {}
+        self.scope = scopes.get(request.method)
+        if self.scope is None:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
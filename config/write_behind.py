@@ -0,0 +1,139 @@
+import atexit
+import logging
+import operator
+import threading
+from collections import Counter
+
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger("config.write_behind")
+
+
+class ToggleQueue:
+    # (대상, 유저) 쌍의 토글을 요청 경로에서 DB 에 쓰지 않고 프로세스 메모리에 모았다가
+    # 백그라운드 스레드가 interval 초마다 (또는 batch 개가 쌓이면) 한 트랜잭션으로 반영한다
+    # 쌍마다 최종 상태만 남기므로 같은 쌍을 여러 번 토글해도 한 번만 쓰고,
+    # 처음 상태로 돌아온 쌍은 아예 쓰지 않는다
+    # apply(adds, removes) 는 트랜잭션 안에서 추가 / 삭제할 쌍 목록을 반영한다
+    def __init__(self, name, apply, interval=1.0, batch=1000):
+        self.name = name
+        self.apply = apply
+        self.interval = interval
+        self.batch = batch
+        self._lock = threading.Lock()
+        # 쌍 -> (최종 상태, DB 상태)
+        self._pending = {}
+        # flush 중인 쌍 (커밋 전까지는 조회에 계속 반영)
+        self._flushing = {}
+        # 대상별 대기 중인 증감 (좋아요 수 등)
+        self._deltas = Counter()
+        self._wakeup = threading.Event()
+        self._worker = None
+
+    def _entry(self, pair):
+        return self._pending.get(pair) or self._flushing.get(pair)
+
+    def state(self, pair):
+        # 대기 중인 토글의 최종 상태, 없으면 None (DB 상태를 따른다)
+        with self._lock:
+            entry = self._entry(pair)
+        return entry[0] if entry else None
+
+    def delta(self, target):
+        return self._deltas.get(target, 0)
+
+    def _update(self, pair, load_state, next_state):
+        # 현재 상태 (대기 중인 토글, 없으면 load_state() 로 읽은 DB 상태) 를 next_state(현재 상태) 로 바꾸고
+        # (새 상태, 바뀌었는지) 를 돌려준다
+        current = self.state(pair)
+        if current is None:
+            current = load_state()
+        with self._lock:
+            # DB 를 읽는 사이 다른 요청이 같은 쌍을 토글했으면 그 상태를 따른다
+            entry = self._entry(pair)
+            if entry:
+                current = entry[0]
+            state = next_state(current)
+            if state == current:
+                return state, False
+            pending = self._pending.get(pair)
+            base = pending[1] if pending else current
+            if state == base:
+                del self._pending[pair]
+            else:
+                self._pending[pair] = (state, base)
+            self._deltas[pair[0]] += 1 if state else -1
+            if not self._deltas[pair[0]]:
+                del self._deltas[pair[0]]
+            full = len(self._pending) >= self.batch
+        self.start()
+        if full:
+            self._wakeup.set()
+        return state, True
+
+    def toggle(self, pair, load_state):
+        # 현재 상태를 뒤집고 새 상태를 돌려준다
+        return self._update(pair, load_state, operator.not_)[0]
+
+    def set(self, pair, state, load_state):
+        # 상태를 state 로 정하고 바뀌었는지 돌려준다 (이미 그 상태면 아무것도 예약하지 않는다)
+        return self._update(pair, load_state, lambda current: state)[1]
+
+    def flush(self):
+        # 대기 중인 토글을 한 트랜잭션으로 반영하고 반영한 쌍 수를 돌려준다
+        with self._lock:
+            if not self._pending:
+                return 0
+            snapshot, self._pending = self._pending, {}
+            self._flushing = snapshot
+        adds = [pair for pair, (state, _) in snapshot.items() if state]
+        removes = [pair for pair, (state, _) in snapshot.items() if not state]
+        try:
+            with transaction.atomic():
+                self.apply(adds, removes)
+        except Exception:
+            # 실패한 토글은 다시 대기열로 (그 사이의 토글이 있으면 그 상태가 최종)
+            with self._lock:
+                for pair, (state, base) in snapshot.items():
+                    newer = self._pending.get(pair)
+                    state = newer[0] if newer else state
+                    if state == base:
+                        self._pending.pop(pair, None)
+                    else:
+                        self._pending[pair] = (state, base)
+                self._flushing = {}
+            raise
+        with self._lock:
+            self._flushing = {}
+            for pair, (state, _) in snapshot.items():
+                self._deltas[pair[0]] -= 1 if state else -1
+                if not self._deltas[pair[0]]:
+                    del self._deltas[pair[0]]
+        return len(snapshot)
+
+    def start(self):
+        # interval 이 None 이면 스레드 없이 flush() 를 직접 호출한다 (테스트)
+        if self.interval is None or self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(
+                target=self._run, name=f"write-behind-{self.name}", daemon=True
+            )
+            self._worker.start()
+        # 프로세스가 끝날 때 남은 토글을 반영한다
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                count = self.flush()
+                if count:
+                    logger.debug("%s: %d건 반영", self.name, count)
+            except Exception:
+                logger.exception("%s: 반영 실패, 다음 주기에 다시 시도", self.name)
+            finally:
+                close_old_connections()